@@ -0,0 +1,7 @@
+"""Execution simulation models shared by the live simulator and backtests."""
+
+from .slippage import SlippageModel
+
+__all__ = [
+    "SlippageModel",
+]
@@ -0,0 +1,34 @@
+"""Trading strategies."""
+
+from typing import Any, Dict, Optional
+
+from .base import BaseStrategy, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_NONE
+from .ema_crossover import EMACrossoverStrategy
+
+# Strategy ID -> strategy class
+STRATEGIES = {
+    "ema_crossover": EMACrossoverStrategy,
+}
+
+
+def get_strategy(strategy_id: str, params: Optional[Dict[str, Any]] = None) -> BaseStrategy:
+    """
+    Instantiate a strategy by ID.
+    
+    Raises:
+        ValueError: If the strategy ID is unknown
+    """
+    if strategy_id not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy_id}'")
+    return STRATEGIES[strategy_id](params)
+
+
+__all__ = [
+    "BaseStrategy",
+    "EMACrossoverStrategy",
+    "STRATEGIES",
+    "get_strategy",
+    "SIGNAL_BUY",
+    "SIGNAL_SELL",
+    "SIGNAL_NONE",
+]
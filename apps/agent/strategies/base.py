@@ -1,8 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Mapping
+import numpy as np
 import pandas as pd
 
 
+# Columnar candle fields passed to `on_candles`
+CANDLE_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Signal values returned by `on_candles`
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_NONE = 0
+
+
 class BaseStrategy(ABC):
     """
     Base class for all trading strategies.
@@ -34,6 +44,44 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def on_candles(
+        self, candles: Mapping[str, np.ndarray], state: Optional[Dict[str, Any]] = None
+    ) -> np.ndarray:
+        """
+        Process a block of candles given as columnar arrays.
+        
+        The default implementation replays `on_candle` row by row, so every
+        strategy supports it. Strategies can override it with a vectorized
+        version that produces the same signals and leaves the same state.
+        
+        Args:
+            candles: Mapping of column name (timestamp, open, high, low, close,
+                volume) to equal-length arrays. Only "close" is required.
+            state: Current strategy state (defaults to `self.state`)
+            
+        Returns:
+            int8 array with one signal per candle (1 buy, -1 sell, 0 none)
+        """
+        if state is None:
+            state = self.state
+        
+        # Convert each column once instead of indexing NumPy scalars per row
+        columns = {
+            name: np.asarray(candles[name]).tolist()
+            for name in CANDLE_COLUMNS
+            if name in candles
+        }
+        n = len(columns["close"])
+        signals = np.zeros(n, dtype=np.int8)
+        
+        for i in range(n):
+            candle = {name: values[i] for name, values in columns.items()}
+            orders = self.on_candle(candle, state)
+            if orders:
+                signals[i] = SIGNAL_BUY if orders[-1]["side"] == "buy" else SIGNAL_SELL
+        
+        return signals
+
     @abstractmethod
     def get_params(self) -> Dict[str, Any]:
         """
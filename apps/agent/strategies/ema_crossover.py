@@ -1,7 +1,12 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Mapping
 import pandas as pd
 import numpy as np
-from .base import BaseStrategy
+from .base import BaseStrategy, SIGNAL_NONE
+
+
+# Persisted position label <-> signal value
+POSITION_TO_SIGNAL = {None: 0, "long": 1, "short": -1}
+SIGNAL_TO_POSITION = {0: None, 1: "long", -1: "short"}
 
 
 class EMACrossoverStrategy(BaseStrategy):
@@ -26,21 +31,27 @@ class EMACrossoverStrategy(BaseStrategy):
             "slow_period": 50,
             "position_size": 0.1,
         }
-        super().__init__(params or default_params)
+        super().__init__({**default_params, **(params or {})})
         
-        self.price_history = []
+        # Running EMA values, updated in O(1) per candle
         self.fast_ema = None
         self.slow_ema = None
+        self.candle_count = 0
         self.position = None  # None, 'long', or 'short'
 
-    def calculate_ema(self, prices: List[float], period: int) -> float:
-        """Calculate Exponential Moving Average."""
-        if len(prices) < period:
-            return None
-        
-        df = pd.Series(prices)
-        ema = df.ewm(span=period, adjust=False).mean().iloc[-1]
-        return ema
+    @staticmethod
+    def update_ema(previous: Optional[float], price: float, period: int) -> float:
+        """
+        Advance an EMA by one price.
+        
+        Same recursion as `pd.Series.ewm(span=period, adjust=False)`, seeded
+        with the first price.
+        """
+        if previous is None:
+            return price
+        
+        alpha = 2.0 / (period + 1)
+        return (1.0 - alpha) * previous + alpha * price
 
     def on_candle(self, candle: Dict[str, Any], state: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -53,26 +64,19 @@ class EMACrossoverStrategy(BaseStrategy):
         Returns:
             List of orders to execute
         """
-        close_price = candle["close"]
-        self.price_history.append(close_price)
-        
-        # Keep only necessary history
-        max_period = max(self.params["fast_period"], self.params["slow_period"])
-        if len(self.price_history) > max_period * 2:
-            self.price_history = self.price_history[-max_period * 2 :]
+        close_price = float(candle["close"])
         
-        # Calculate EMAs
+        # Update EMAs incrementally
         prev_fast_ema = self.fast_ema
         prev_slow_ema = self.slow_ema
         
-        self.fast_ema = self.calculate_ema(self.price_history, self.params["fast_period"])
-        self.slow_ema = self.calculate_ema(self.price_history, self.params["slow_period"])
+        self.fast_ema = self.update_ema(self.fast_ema, close_price, self.params["fast_period"])
+        self.slow_ema = self.update_ema(self.slow_ema, close_price, self.params["slow_period"])
+        self.candle_count += 1
         
-        # Not enough data yet
-        if self.fast_ema is None or self.slow_ema is None:
-            return []
-        
-        if prev_fast_ema is None or prev_slow_ema is None:
+        # Not enough data yet - both EMAs and their previous values need a full period
+        max_period = max(self.params["fast_period"], self.params["slow_period"])
+        if self.candle_count <= max_period:
             return []
         
         orders = []
@@ -114,6 +118,78 @@ class EMACrossoverStrategy(BaseStrategy):
         
         return orders
 
+    def on_candles(
+        self, candles: Mapping[str, np.ndarray], state: Optional[Dict[str, Any]] = None
+    ) -> np.ndarray:
+        """
+        Vectorized equivalent of calling `on_candle` for every row.
+        
+        Continues from the current EMA state, emits the same crossover signals
+        and leaves the strategy in the same state as the per-candle loop.
+        
+        Args:
+            candles: Columnar candle arrays (only "close" is used)
+            state: Strategy state (unused, kept for interface compatibility)
+            
+        Returns:
+            int8 array with one signal per candle (1 buy, -1 sell, 0 none)
+        """
+        close = np.asarray(candles["close"], dtype=np.float64)
+        n = len(close)
+        signals = np.full(n, SIGNAL_NONE, dtype=np.int8)
+        if n == 0:
+            return signals
+        
+        fast_period = self.params["fast_period"]
+        slow_period = self.params["slow_period"]
+        max_period = max(fast_period, slow_period)
+        
+        fast = self._ema_array(close, self.fast_ema, fast_period)
+        slow = self._ema_array(close, self.slow_ema, slow_period)
+        diff = fast - slow
+        
+        prev_diff = np.empty(n)
+        prev_diff[0] = (
+            self.fast_ema - self.slow_ema if self.fast_ema is not None else np.nan
+        )
+        prev_diff[1:] = diff[:-1]
+        
+        # Same warm-up rule as on_candle: candle_count must exceed max_period
+        ready = self.candle_count + np.arange(1, n + 1) > max_period
+        
+        events = np.zeros(n, dtype=np.int8)
+        events[ready & (prev_diff <= 0) & (diff > 0)] = 1
+        events[ready & (prev_diff >= 0) & (diff < 0)] = -1
+        
+        # Forward-fill the last crossover direction, starting from the current position
+        initial_position = POSITION_TO_SIGNAL[self.position]
+        last_event = np.where(events != 0, np.arange(n), -1)
+        np.maximum.accumulate(last_event, out=last_event)
+        positions = np.where(last_event >= 0, events[last_event], initial_position)
+        
+        # Only a change of position produces an order
+        prev_positions = np.empty(n, dtype=np.int8)
+        prev_positions[0] = initial_position
+        prev_positions[1:] = positions[:-1]
+        changed = positions != prev_positions
+        signals[changed] = positions[changed]
+        
+        self.fast_ema = float(fast[-1])
+        self.slow_ema = float(slow[-1])
+        self.candle_count += n
+        self.position = SIGNAL_TO_POSITION[int(positions[-1])]
+        
+        return signals
+
+    @staticmethod
+    def _ema_array(close: np.ndarray, seed: Optional[float], period: int) -> np.ndarray:
+        """EMA over an array, continuing from `seed` when one exists."""
+        if seed is None:
+            return pd.Series(close).ewm(span=period, adjust=False).mean().to_numpy()
+        
+        seeded = np.concatenate(([seed], close))
+        return pd.Series(seeded).ewm(span=period, adjust=False).mean().to_numpy()[1:]
+
     def get_params(self) -> Dict[str, Any]:
         """Get strategy parameters."""
         return self.params
@@ -121,15 +197,27 @@ class EMACrossoverStrategy(BaseStrategy):
     def serialize_state(self) -> Dict[str, Any]:
         """Serialize strategy state."""
         return {
-            "price_history": self.price_history,
             "fast_ema": self.fast_ema,
             "slow_ema": self.slow_ema,
+            "candle_count": self.candle_count,
             "position": self.position,
         }
 
     def load_state(self, state: Dict[str, Any]) -> None:
         """Load strategy state."""
-        self.price_history = state.get("price_history", [])
-        self.fast_ema = state.get("fast_ema")
-        self.slow_ema = state.get("slow_ema")
         self.position = state.get("position")
+        
+        if "candle_count" in state:
+            self.fast_ema = state.get("fast_ema")
+            self.slow_ema = state.get("slow_ema")
+            self.candle_count = state["candle_count"]
+            return
+        
+        # Legacy state persisted the raw price list - replay it into the EMAs
+        self.fast_ema = None
+        self.slow_ema = None
+        self.candle_count = 0
+        for price in state.get("price_history", []):
+            self.fast_ema = self.update_ema(self.fast_ema, float(price), self.params["fast_period"])
+            self.slow_ema = self.update_ema(self.slow_ema, float(price), self.params["slow_period"])
+            self.candle_count += 1
@@ -1,6 +1,7 @@
 """Account management API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from typing import List
@@ -14,6 +15,7 @@ from app.models.user import User
 from app.models.account import Account
 from app.models.ledger_entry import LedgerEntry
 from app.schemas.account import CreateAccountRequest, AccountResponse, AccountSummary
+from app.services.ledger import EXPORT_MEDIA_TYPES, stream_ledger_export
 
 router = APIRouter()
 
@@ -46,6 +48,8 @@ async def create_account(
         is_demo=request.is_demo,
         is_active=True,
         max_leverage=request.max_leverage,
+        position_mode=request.position_mode,
+        execution_mode=request.execution_mode,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
     )
@@ -134,6 +138,52 @@ async def get_account(
     return account
 
 
+@router.get("/{account_id}/ledger/export")
+async def export_ledger(
+    account_id: str,
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Export an account's full ledger history.
+    
+    - Streams every entry oldest first as CSV or NDJSON
+    - Rows are read in chunks through a server-side cursor
+    """
+    from uuid import UUID
+    
+    try:
+        account_uuid = UUID(account_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid account ID format",
+        )
+    
+    result = await session.execute(
+        select(Account).where(
+            Account.id == account_uuid,
+            Account.user_id == current_user.id,
+        )
+    )
+    account = result.scalar_one_or_none()
+    
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found",
+        )
+    
+    return StreamingResponse(
+        stream_ledger_export(account.id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="ledger-{account.id}.{format}"',
+        },
+    )
+
+
 @router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_account(
     account_id: str,
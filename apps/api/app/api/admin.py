@@ -1,9 +1,10 @@
 """Admin API endpoints for platform management."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, func
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
 
 from app.core.database import get_session as get_db
@@ -16,6 +17,7 @@ from app.models import (
     Payout,
     KYCSubmission,
 )
+from app.services.ledger import EXPORT_MEDIA_TYPES, stream_ledger_export
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -1171,3 +1173,30 @@ async def toggle_tier_status(
         "message": f"Tier {'activated' if tier.is_active else 'deactivated'} successfully",
         "tier": tier,
     }
+
+
+# ==================== Ledger Export ====================
+
+@router.get("/ledger/export")
+async def export_ledger(
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    account_id: Optional[str] = Query(default=None, description="Limit the export to one account"),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """Stream the platform-wide (or one account's) ledger for audit."""
+    
+    from uuid import UUID
+    
+    account_uuid = None
+    if account_id:
+        try:
+            account_uuid = UUID(account_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid account ID format")
+    
+    filename = f"ledger-{account_uuid or 'all'}.{format}"
+    return StreamingResponse(
+        stream_ledger_export(account_uuid, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -28,6 +28,9 @@ async def create_backtest(
     
     - Validates date range and instrument
     - Queues backtest job to Celery worker
+    - With `param_grid`, runs a parameter sweep and ranks every combination
+    - With `walk_forward` + `param_grid`, runs walk-forward optimization
+    - With `monte_carlo_simulations`, adds a trade-resampling risk report
     - Returns job ID for status tracking
     """
     # Validate instrument
@@ -49,6 +52,15 @@ async def create_backtest(
             detail="End date must be after start date",
         )
     
+    # Determine run mode
+    walk_forward = request.walk_forward.model_dump() if request.walk_forward else None
+    if walk_forward:
+        mode = "walk_forward"
+    elif request.param_grid:
+        mode = "sweep"
+    else:
+        mode = "single"
+    
     # Create backtest record
     backtest = Backtest(
         id=uuid4(),
@@ -56,6 +68,9 @@ async def create_backtest(
         strategy_id=request.strategy_id,
         instrument_id=request.instrument_id,
         params=request.params,
+        mode=mode,
+        param_grid=request.param_grid,
+        walk_forward=walk_forward,
         start_date=request.start_date,
         end_date=request.end_date,
         initial_capital=request.initial_capital,
@@ -83,6 +98,11 @@ async def create_backtest(
                 "start_date": request.start_date.isoformat(),
                 "end_date": request.end_date.isoformat(),
                 "initial_capital": request.initial_capital,
+                "timeframe": request.timeframe,
+                "param_grid": request.param_grid,
+                "walk_forward": walk_forward,
+                "monte_carlo_simulations": request.monte_carlo_simulations,
+                "monte_carlo_seed": request.monte_carlo_seed,
             }
         )
         
@@ -173,6 +193,7 @@ async def get_backtest(
                     backtest.status = "completed"
                     backtest.progress = 1.0
                     backtest.metrics = result.get("metrics", {})
+                    backtest.monte_carlo = result.get("monte_carlo")
                     backtest.completed_at = datetime.utcnow()
                 else:
                     backtest.status = "failed"
@@ -27,6 +27,7 @@ from app.schemas.crypto import (
     CryptoEstimateResponse,
 )
 from app.schemas.auth import MessageResponse
+from app.services.ledger import LedgerPosting, LedgerService
 from app.services.nowpayments import nowpayments
 
 router = APIRouter()
@@ -330,37 +331,25 @@ async def create_withdrawal(
     session.add(transaction)
     await session.flush()
     
-    # Deduct from account balance
-    account.balance -= total_deduction
-    account.updated_at = datetime.utcnow()
-    session.add(account)
-    
-    # Create ledger entries
-    withdrawal_entry = LedgerEntry(
-        id=uuid4(),
-        account_id=account.id,
-        entry_type="withdrawal",
-        amount=-Decimal(str(request.usd_amount)),
-        balance_after=account.balance + withdrawal_fee,  # Before fee deduction
-        currency=account.base_currency,
-        description=f"Crypto withdrawal: {crypto_amount} {request.crypto_currency}",
-        meta={"transaction_id": str(transaction_id)},
-        created_at=datetime.utcnow(),
-    )
-    session.add(withdrawal_entry)
-    
-    fee_entry = LedgerEntry(
-        id=uuid4(),
-        account_id=account.id,
-        entry_type="fee",
-        amount=-withdrawal_fee,
-        balance_after=account.balance,
-        currency=account.base_currency,
-        description=f"Withdrawal fee ({settings.WITHDRAWAL_FEE_PERCENT}%)",
-        meta={"transaction_id": str(transaction_id)},
-        created_at=datetime.utcnow(),
-    )
-    session.add(fee_entry)
+    # Deduct the amount and the fee from the account balance
+    await LedgerService(session).post_batch([
+        LedgerPosting(
+            account_id=account.id,
+            entry_type="withdrawal",
+            amount=-Decimal(str(request.usd_amount)),
+            currency=account.base_currency,
+            description=f"Crypto withdrawal: {crypto_amount} {request.crypto_currency}",
+            meta={"transaction_id": str(transaction_id)},
+        ),
+        LedgerPosting(
+            account_id=account.id,
+            entry_type="fee",
+            amount=-withdrawal_fee,
+            currency=account.base_currency,
+            description=f"Withdrawal fee ({settings.WITHDRAWAL_FEE_PERCENT}%)",
+            meta={"transaction_id": str(transaction_id)},
+        ),
+    ])
     
     # Create payout via NOWPayments
     try:
@@ -398,13 +387,8 @@ async def create_withdrawal(
         )
         
     except Exception as e:
-        # Rollback balance deduction
-        account.balance += total_deduction
-        session.add(account)
-        await session.delete(withdrawal_entry)
-        await session.delete(fee_entry)
-        await session.delete(transaction)
-        await session.commit()
+        # Undo the transaction record, ledger entries and balance deduction
+        await session.rollback()
         
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,10 +1,12 @@
 """Market data API endpoints."""
 
+import base64
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID
 
 from app.core.database import get_session
@@ -18,6 +20,18 @@ from app.schemas.market import (
 
 router = APIRouter()
 
+EPOCH = datetime(1970, 1, 1)
+
+# Bar length per supported timeframe
+TIMEFRAME_INTERVALS = {
+    "1m": timedelta(minutes=1),
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+    "1h": timedelta(hours=1),
+    "4h": timedelta(hours=4),
+    "1d": timedelta(days=1),
+}
+
 
 @router.get("/instruments", response_model=List[InstrumentResponse])
 async def get_instruments(
@@ -79,14 +93,23 @@ async def get_candles(
     from_time: Optional[datetime] = Query(default=None, description="Start time (UTC)"),
     to_time: Optional[datetime] = Query(default=None, description="End time (UTC)"),
     limit: int = Query(default=100, ge=1, le=1000, description="Maximum candles to return"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    count: str = Query(
+        default="none",
+        pattern="^(exact|estimate|none)$",
+        description="Total mode: none (default), estimate (from range span) or exact (COUNT)",
+    ),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Get candlestick (OHLCV) data for charting.
     
-    - Returns historical price data
+    - Returns historical price data, newest page first
     - Supports multiple timeframes
-    - Paginated results (max 1000 per request)
+    - Keyset pagination: pass `next_cursor` back as `cursor` to page into
+      older history (max 1000 per request)
+    - No total by default; `count=estimate` derives it from the range span
+      and `count=exact` opts into a full COUNT of the range
     """
     # Get instrument
     result = await session.execute(
@@ -100,39 +123,46 @@ async def get_candles(
             detail=f"Instrument '{symbol}' not found",
         )
     
-    # Build candles query
-    query = select(Candle).where(
+    # Range filters shared by the page and count queries
+    filters = [
         Candle.instrument_id == instrument.id,
         Candle.timeframe == timeframe,
-    )
-    
+    ]
     if from_time:
-        query = query.where(Candle.timestamp >= from_time)
-    
+        filters.append(Candle.timestamp >= from_time)
     if to_time:
-        query = query.where(Candle.timestamp <= to_time)
-    
-    # Order by timestamp descending (newest first)
-    query = query.order_by(Candle.timestamp.desc()).limit(limit)
+        filters.append(Candle.timestamp <= to_time)
+    
+    # Seek past the previous page on the (instrument_id, timeframe, timestamp) index
+    page_filters = list(filters)
+    if cursor:
+        page_filters.append(Candle.timestamp < _decode_cursor(cursor))
+    
+    # Order by timestamp descending (newest first); one extra row tells us if
+    # another page exists
+    query = (
+        select(Candle)
+        .where(*page_filters)
+        .order_by(Candle.timestamp.desc())
+        .limit(limit + 1)
+    )
     
     result = await session.execute(query)
     candles = result.scalars().all()
     
-    # Count total available candles (for pagination info)
-    count_query = select(Candle).where(
-        Candle.instrument_id == instrument.id,
-        Candle.timeframe == timeframe,
-    )
-    if from_time:
-        count_query = count_query.where(Candle.timestamp >= from_time)
-    if to_time:
-        count_query = count_query.where(Candle.timestamp <= to_time)
+    next_cursor = None
+    if len(candles) > limit:
+        candles = candles[:limit]
+        next_cursor = _encode_cursor(candles[-1].timestamp)
     
-    from sqlalchemy import func
-    count_result = await session.execute(
-        select(func.count()).select_from(count_query.subquery())
-    )
-    total = count_result.scalar() or 0
+    total = None
+    if count == "exact":
+        count_result = await session.execute(
+            select(func.count()).select_from(Candle).where(*filters)
+        )
+        total = count_result.scalar() or 0
+    elif count == "estimate":
+        total = await _estimate_candle_count(session, filters, timeframe)
     
     # Reverse to get chronological order
     candles_list = list(reversed(candles))
@@ -140,6 +170,52 @@ async def get_candles(
     return CandlesResponse(
         candles=candles_list,
         total=total,
+        total_is_estimate=count == "estimate",
+        next_cursor=next_cursor,
         symbol=symbol.upper(),
         timeframe=timeframe,
     )
+
+
+def _encode_cursor(timestamp: datetime) -> str:
+    """Opaque page cursor: the oldest timestamp already returned."""
+    value = str(int((timestamp - EPOCH).total_seconds()))
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> datetime:
+    """Decode a page cursor back into a timestamp."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        seconds = int(base64.urlsafe_b64decode(padded.encode()).decode())
+        return EPOCH + timedelta(seconds=seconds)
+    except (ValueError, OverflowError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+async def _estimate_candle_count(
+    session: AsyncSession, filters: list, timeframe: str
+) -> int:
+    """
+    Estimate candles in range from its first/last timestamp.
+    
+    min/max are two index seeks, so this stays constant-time on long ranges;
+    it is exact whenever the series has no gaps.
+    """
+    interval = TIMEFRAME_INTERVALS.get(timeframe)
+    result = await session.execute(
+        select(
+            func.min(Candle.timestamp),
+            func.max(Candle.timestamp),
+        ).where(*filters)
+    )
+    first, last = result.one()
+    
+    if first is None:
+        return 0
+    if interval is None:
+        return 1
+    return int((last - first) / interval) + 1
@@ -1,9 +1,10 @@
 """Order management API endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from uuid import uuid4, UUID
 
@@ -17,9 +18,20 @@ from app.schemas.order import (
     CreateOrderRequest,
     OrderResponse,
     CancelOrderRequest,
+    CreateOrdersBatchRequest,
+    BatchOrderResult,
+    BatchOrderResponse,
 )
 from app.schemas.auth import MessageResponse
+from app.services.account_actor import account_actors
+from app.services.client_orders import (
+    DuplicateClientOrderError,
+    client_orders,
+    find_client_orders,
+    replay_error,
+)
 from app.services.execution import ExecutionService
+from app.services.order_book import order_book
 
 router = APIRouter()
 
@@ -35,9 +47,11 @@ async def place_order(
     Place a new order.
     
     - Creates and executes a simulated order
+    - Limit/stop orders the market has not reached rest as "pending"
     - Updates account balances
     - Creates or updates positions
     - Generates ledger entries
+    - Resubmitting a `client_order_id` returns the original order without re-executing
     """
     # Validate account
     try:
@@ -68,49 +82,303 @@ async def place_order(
             detail="Account is not active",
         )
     
+    # Replay an earlier submission with the same client order ID
+    if request.client_order_id:
+        replayed = await _replay_client_order(session, account.id, request.client_order_id)
+        if replayed is not None:
+            return replayed
+    
     # Validate instrument
     instrument_result = await session.execute(
         select(Instrument).where(Instrument.id == request.instrument_id)
     )
     instrument = instrument_result.scalar_one_or_none()
     
-    if not instrument:
+    error = _validate_order(request, account, instrument)
+    if error:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Instrument not found",
+            status_code=status.HTTP_404_NOT_FOUND if instrument is None else status.HTTP_400_BAD_REQUEST,
+            detail=error,
         )
     
-    if not instrument.is_tradeable:
+    # Create order
+    new_order = _build_order(request, account)
+    
+    if account.execution_mode == "actor":
+        # Executed and persisted by the account's single-writer actor
+        try:
+            execution_result = await account_actors.submit(account.id, new_order)
+        except DuplicateClientOrderError as e:
+            client_orders.put(e.order, replay_error(e.order))
+            return await _replay_client_order(session, account.id, request.client_order_id)
+    else:
+        session.add(new_order)
+        try:
+            await session.flush()
+        except IntegrityError:
+            if not request.client_order_id:
+                raise
+            # A concurrent request with the same client order ID inserted first
+            await session.rollback()
+            return await _replay_client_order(session, account_uuid, request.client_order_id)
+        
+        # Execute order
+        execution_service = ExecutionService(session)
+        execution_result = await execution_service.execute_order(
+            new_order, account, instrument
+        )
+        
+        await session.commit()
+        await session.refresh(new_order)
+    
+    error = None
+    if not execution_result["success"]:
+        error = execution_result.get("error", "Order execution failed")
+    client_orders.put(new_order, error)
+    
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Instrument is not tradeable",
+            detail=error,
         )
     
-    # Validate size
-    if request.size < instrument.min_size:
+    return new_order
+
+
+@router.post("/{account_id}/orders/batch", response_model=BatchOrderResponse)
+async def place_orders_batch(
+    account_id: str,
+    request: CreateOrdersBatchRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Place several orders in one request.
+    
+    - One account lookup and one instrument lookup for the whole batch
+    - Orders execute in sequence against the same in-memory account state
+    - Orders, positions and ledger entries are committed in one transaction
+      (actor accounts: by the account's actor, like single orders)
+    - Returns a result per order; invalid or rejected orders do not abort the batch
+    - Orders whose `client_order_id` was already used return the original result
+    """
+    # Validate account
+    try:
+        account_uuid = UUID(account_id)
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Order size must be at least {instrument.min_size}",
+            detail="Invalid account ID format",
         )
     
-    if instrument.max_size and request.size > instrument.max_size:
+    result = await session.execute(
+        select(Account).where(
+            Account.id == account_uuid,
+            Account.user_id == current_user.id,
+        )
+    )
+    account = result.scalar_one_or_none()
+    
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found",
+        )
+    
+    if not account.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Order size cannot exceed {instrument.max_size}",
+            detail="Account is not active",
         )
     
-    # Validate leverage
-    if request.leverage > account.max_leverage:
+    # Load every referenced instrument at once
+    instrument_ids = {order.instrument_id for order in request.orders}
+    instrument_result = await session.execute(
+        select(Instrument).where(Instrument.id.in_(instrument_ids))
+    )
+    instruments = {i.id: i for i in instrument_result.scalars().all()}
+    
+    # Earlier submissions: recent ones from the cache, the rest in one query
+    replays: Dict[str, Tuple[OrderResponse, Optional[str]]] = {}
+    uncached = []
+    for order_request in request.orders:
+        if order_request.client_order_id:
+            cached = client_orders.get(account.id, order_request.client_order_id)
+            if cached is None:
+                uncached.append(order_request.client_order_id)
+            else:
+                replays[order_request.client_order_id] = cached
+    
+    for order in (await find_client_orders(session, account.id, uncached)).values():
+        client_orders.put(order, replay_error(order))
+        replays[order.client_order_id] = (OrderResponse.model_validate(order), replay_error(order))
+    
+    execution_service = ExecutionService(session)
+    results = []
+    placed_orders = []
+    actor_orders = []
+    submitted = set()
+    repeated = []
+    
+    for index, order_request in enumerate(request.orders):
+        client_order_id = order_request.client_order_id
+        if client_order_id in replays:
+            results.append(_replayed_result(index, *replays[client_order_id]))
+            continue
+        
+        instrument = instruments.get(order_request.instrument_id)
+        
+        error = _validate_order(order_request, account, instrument)
+        if error:
+            results.append(BatchOrderResult(index=index, success=False, error=error))
+            continue
+        
+        if client_order_id and client_order_id in submitted:
+            # Repeated within this batch: answered with the first one's result
+            repeated.append((index, client_order_id))
+            continue
+        
+        new_order = _build_order(order_request, account)
+        if client_order_id:
+            submitted.add(client_order_id)
+        if account.execution_mode == "actor":
+            # Executed together by the account's actor below
+            actor_orders.append((index, new_order))
+            continue
+        
+        session.add(new_order)
+        
+        execution_result = await execution_service.execute_order(
+            new_order, account, instrument
+        )
+        
+        # Make this order's positions visible to the next one's netting query
+        try:
+            await session.flush()
+        except IntegrityError:
+            # A concurrent request used one of these client order IDs first
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A client order ID in this batch was submitted concurrently; retry the batch",
+            )
+        
+        placed_orders.append((index, new_order, execution_result))
+    
+    if actor_orders:
+        outcomes = await account_actors.submit_many(account.id, [order for _, order in actor_orders])
+        for (index, order), outcome in zip(actor_orders, outcomes):
+            if isinstance(outcome, DuplicateClientOrderError):
+                error = replay_error(outcome.order)
+                client_orders.put(outcome.order, error)
+                replays[order.client_order_id] = (OrderResponse.model_validate(outcome.order), error)
+                results.append(_replayed_result(index, *replays[order.client_order_id]))
+            elif isinstance(outcome, Exception):
+                # Only this order's savepoint was rolled back; repeats share its failure
+                if order.client_order_id:
+                    replays[order.client_order_id] = (None, "Order execution failed")
+                results.append(BatchOrderResult(index=index, success=False, error="Order execution failed"))
+            else:
+                placed_orders.append((index, order, outcome))
+    
+    await session.commit()
+    
+    for index, order, execution_result in placed_orders:
+        error = None if execution_result["success"] else execution_result.get("error", "Order execution failed")
+        client_orders.put(order, error)
+        result = BatchOrderResult(
+            index=index,
+            success=execution_result["success"],
+            order=OrderResponse.model_validate(order),
+            error=error,
+        )
+        results.append(result)
+        if order.client_order_id:
+            replays[order.client_order_id] = (result.order, error)
+    
+    for index, client_order_id in repeated:
+        results.append(_replayed_result(index, *replays[client_order_id]))
+    
+    results.sort(key=lambda r: r.index)
+    placed = sum(1 for r in results if r.success)
+    
+    return BatchOrderResponse(
+        results=results,
+        placed=placed,
+        failed=len(results) - placed,
+    )
+
+
+async def _replay_client_order(
+    session: AsyncSession, account_id: UUID, client_order_id: str
+) -> Optional[OrderResponse]:
+    """
+    Answer a resubmitted client order ID with the original result.
+    
+    Returns:
+        The original order, or None if the ID has not been used on the account
+        
+    Raises:
+        HTTPException: The original submission was rejected
+    """
+    cached = client_orders.get(account_id, client_order_id)
+    if cached is None:
+        existing = await find_client_orders(session, account_id, [client_order_id])
+        order = existing.get(client_order_id)
+        if order is None:
+            return None
+        client_orders.put(order, replay_error(order))
+        cached = (OrderResponse.model_validate(order), replay_error(order))
+    
+    response, error = cached
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Leverage cannot exceed account maximum of {account.max_leverage}x",
+            detail=error,
         )
+    return response
+
+
+def _replayed_result(index: int, response: Optional[OrderResponse], error: Optional[str]) -> BatchOrderResult:
+    """Batch result for an order answered from an earlier submission."""
+    return BatchOrderResult(index=index, success=error is None, order=response, error=error)
+
+
+def _validate_order(
+    request: CreateOrderRequest, account: Account, instrument: Optional[Instrument]
+) -> Optional[str]:
+    """
+    Check an order request against its account and instrument.
     
-    # Create order
-    new_order = Order(
+    Returns:
+        Error message, or None if the order may be placed
+    """
+    if not instrument:
+        return "Instrument not found"
+    
+    if not instrument.is_tradeable:
+        return "Instrument is not tradeable"
+    
+    # Validate size
+    if request.size < instrument.min_size:
+        return f"Order size must be at least {instrument.min_size}"
+    
+    if instrument.max_size and request.size > instrument.max_size:
+        return f"Order size cannot exceed {instrument.max_size}"
+    
+    # Validate leverage
+    if request.leverage > account.max_leverage:
+        return f"Leverage cannot exceed account maximum of {account.max_leverage}x"
+    
+    return None
+
+
+def _build_order(request: CreateOrderRequest, account: Account) -> Order:
+    """Create a pending order from a request."""
+    return Order(
         id=uuid4(),
         account_id=account.id,
-        instrument_id=instrument.id,
+        instrument_id=request.instrument_id,
         order_type=request.order_type.value,
         side=request.side.value,
         size=request.size,
@@ -121,28 +389,9 @@ async def place_order(
         commission=0,
         leverage=request.leverage,
         margin_required=0,
+        client_order_id=request.client_order_id,
         created_at=datetime.utcnow(),
     )
-    
-    session.add(new_order)
-    await session.flush()
-    
-    # Execute order
-    execution_service = ExecutionService(session)
-    execution_result = await execution_service.execute_order(
-        new_order, account, instrument
-    )
-    
-    await session.commit()
-    await session.refresh(new_order)
-    
-    if not execution_result["success"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=execution_result.get("error", "Order execution failed"),
-        )
-    
-    return new_order
 
 
 @router.get("/{account_id}/orders", response_model=List[OrderResponse])
@@ -265,6 +514,7 @@ async def cancel_order(
     
     - Only pending orders can be canceled
     - Filled orders cannot be canceled
+    - Orders the market is filling right now return 409
     """
     # Validate IDs
     try:
@@ -276,12 +526,15 @@ async def cancel_order(
             detail="Invalid ID format",
         )
     
-    # Validate account
+    # Validate account; lock it, then the order, in the same order as ticker
+    # fills (ExecutionService._lock_accounts) so a cancel never races a fill
     account_result = await session.execute(
-        select(Account).where(
+        select(Account)
+        .where(
             Account.id == account_uuid,
             Account.user_id == current_user.id,
         )
+        .with_for_update()
     )
     account = account_result.scalar_one_or_none()
     
@@ -291,12 +544,14 @@ async def cancel_order(
             detail="Account not found",
         )
     
-    # Get order
+    # Get order; its status is read under the lock, after any fill committed
     order_result = await session.execute(
-        select(Order).where(
+        select(Order)
+        .where(
             Order.id == order_uuid,
             Order.account_id == account.id,
         )
+        .with_for_update()
     )
     order = order_result.scalar_one_or_none()
     
@@ -313,10 +568,21 @@ async def cancel_order(
             detail=f"Cannot cancel order with status '{order.status}'",
         )
     
+    # Matched by this process's ticker but not committed yet
+    if order_book.in_flight(order.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order is being filled",
+        )
+    
     # Cancel order
     order.status = "canceled"
     order.canceled_at = datetime.utcnow()
     session.add(order)
     await session.commit()
     
+    # After the commit, so a failed commit leaves the order resting; a tick
+    # in between finds it canceled under the row lock and drops it
+    order_book.remove(order.id)
+    
     return MessageResponse(message=f"Order {order_id} canceled successfully")
@@ -18,7 +18,9 @@ from app.schemas.position import (
     UpdatePositionRequest,
 )
 from app.schemas.auth import MessageResponse
+from app.services.execution import ExecutionService
 from app.services.pnl import PnLCalculator
+from app.services.position_triggers import position_triggers
 
 router = APIRouter()
 
@@ -75,6 +77,7 @@ async def get_positions(
     
     # Update P&L for open positions
     pnl_calculator = PnLCalculator(session)
+    await pnl_calculator.load_prices(positions)
     for position in positions:
         if position.is_open:
             await pnl_calculator.update_position_pnl(position)
@@ -161,6 +164,7 @@ async def close_position(
     - Closes position at current market price
     - Updates account balance with realized P&L
     - Creates ledger entries
+    - Positions whose stop loss / take profit is closing them return 409
     """
     # Validate account
     try:
@@ -171,11 +175,15 @@ async def close_position(
             detail="Invalid account ID format",
         )
     
+    # Lock the account, then the position, in the same order as SL/TP
+    # trigger closes (ExecutionService._lock_accounts)
     account_result = await session.execute(
-        select(Account).where(
+        select(Account)
+        .where(
             Account.id == account_uuid,
             Account.user_id == current_user.id,
         )
+        .with_for_update()
     )
     account = account_result.scalar_one_or_none()
     
@@ -185,12 +193,14 @@ async def close_position(
             detail="Account not found",
         )
     
-    # Get position
+    # Get position; is_open is read under the lock, after any trigger close
     position_result = await session.execute(
-        select(Position).where(
+        select(Position)
+        .where(
             Position.id == request.position_id,
             Position.account_id == account.id,
         )
+        .with_for_update()
     )
     position = position_result.scalar_one_or_none()
     
@@ -206,6 +216,13 @@ async def close_position(
             detail="Position is already closed",
         )
     
+    # Its SL/TP was hit and this process's ticker is closing it
+    if position_triggers.in_flight(position.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Position is being closed by its stop loss / take profit",
+        )
+    
     # Update P&L
     pnl_calculator = PnLCalculator(session)
     await pnl_calculator.update_position_pnl(position)
@@ -218,62 +235,27 @@ async def close_position(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Close size cannot exceed position size",
         )
+    full_close = close_size >= position.size
     
-    # Calculate partial P&L
-    pnl_ratio = close_size / position.size
-    realized_pnl = position.unrealized_pnl * pnl_ratio
-    
-    # Update account balance
-    account.balance += realized_pnl
-    account.margin_used -= (position.margin_used * pnl_ratio)
-    account.margin_available += (position.margin_used * pnl_ratio)
-    account.equity = account.balance + account.margin_used
-    account.updated_at = datetime.utcnow()
-    session.add(account)
-    
-    # Create ledger entry
-    from app.models.ledger_entry import LedgerEntry
-    from uuid import uuid4
-    ledger_entry = LedgerEntry(
-        id=uuid4(),
-        account_id=account.id,
-        entry_type="trade_pnl",
-        amount=realized_pnl,
-        balance_after=account.balance,
-        currency=account.base_currency,
-        position_id=position.id,
-        description=f"P&L from closing position {position.id}",
-        meta={
-            "entry_price": float(position.entry_price),
-            "exit_price": float(position.current_price),
-            "size": float(close_size),
-            "pnl": float(realized_pnl),
-        },
-        created_at=datetime.utcnow(),
-    )
-    session.add(ledger_entry)
-    
-    # Update or close position
-    if close_size >= position.size:
-        # Full close
-        position.is_open = False
-        position.closed_at = datetime.utcnow()
-        position.realized_pnl = realized_pnl
-        position.unrealized_pnl = 0
+    # Close through the shared ledger path
+    execution_service = ExecutionService(session)
+    try:
+        realized_pnl = await execution_service.close_position(
+            position, account, position.current_price, close_size
+        )
+        await session.commit()
+    except Exception:
+        # Nothing was closed: keep watching the position's SL/TP
+        await session.rollback()
+        await session.refresh(position)
+        position_triggers.add(position)
+        raise
+    
+    if full_close:
         message = f"Position {request.position_id} fully closed with P&L: {float(realized_pnl):.2f}"
     else:
-        # Partial close
-        position.size -= close_size
-        position.margin_used -= (position.margin_used * pnl_ratio)
-        position.realized_pnl += realized_pnl
-        position.unrealized_pnl -= realized_pnl
         message = f"Position {request.position_id} partially closed ({float(close_size)} size) with P&L: {float(realized_pnl):.2f}"
     
-    position.updated_at = datetime.utcnow()
-    session.add(position)
-    
-    await session.commit()
-    
     return MessageResponse(message=message)
 
 
@@ -290,6 +272,7 @@ async def update_position(
     
     - Modifies position risk management settings
     - Does not execute trades
+    - Positions whose stop loss / take profit is closing them return 409
     """
     # Validate IDs
     try:
@@ -302,11 +285,15 @@ async def update_position(
         )
     
     # Validate account
+    # Lock the account, then the position, in the same order as SL/TP
+    # trigger closes (ExecutionService._lock_accounts)
     account_result = await session.execute(
-        select(Account).where(
+        select(Account)
+        .where(
             Account.id == account_uuid,
             Account.user_id == current_user.id,
         )
+        .with_for_update()
     )
     account = account_result.scalar_one_or_none()
     
@@ -316,12 +303,14 @@ async def update_position(
             detail="Account not found",
         )
     
-    # Get position
+    # Get position under the lock
     position_result = await session.execute(
-        select(Position).where(
+        select(Position)
+        .where(
             Position.id == position_uuid,
             Position.account_id == account.id,
         )
+        .with_for_update()
     )
     position = position_result.scalar_one_or_none()
     
@@ -337,6 +326,13 @@ async def update_position(
             detail="Cannot update closed position",
         )
     
+    # Its SL/TP was hit and this process's ticker is closing it
+    if position_triggers.in_flight(position.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Position is being closed by its stop loss / take profit",
+        )
+    
     # Update stop loss / take profit
     if request.stop_loss is not None:
         position.stop_loss = request.stop_loss
@@ -350,4 +346,7 @@ async def update_position(
     await session.commit()
     await session.refresh(position)
     
+    # Watch the committed levels (no trigger for it is in flight, see above)
+    position_triggers.add(position)
+    
     return position
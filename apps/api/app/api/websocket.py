@@ -1,11 +1,128 @@
 """WebSocket manager for real-time updates."""
 
-from typing import Dict, Set
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Optional, Set, Tuple
 from fastapi import WebSocket
 from uuid import UUID
 import json
 import asyncio
 
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+
+# Redis channel carrying one account's updates
+CHANNEL_PREFIX = "ws:account:"
+
+# What a connection's full outbound queue does with a new message
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+def _coalesce_key(message: dict) -> Hashable:
+    """Messages with equal keys supersede each other (same type and subject)."""
+    data = message.get("data")
+    subject = data.get("id") if isinstance(data, dict) else None
+    return message.get("type"), subject
+
+
+class ConnectionWriter:
+    """
+    Bounded outbound queue for one WebSocket, drained by its own task.
+    
+    Enqueueing never waits on the socket, so a slow client only delays its
+    own messages. When the queue is full the overflow policy applies:
+    "drop_oldest" discards the oldest queued message, "coalesce" replaces
+    the queued message for the same type and subject (falling back to the
+    oldest), and "disconnect" closes the connection.
+    """
+    
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_close: Callable[[], None],
+        max_queue: int = settings.WEBSOCKET_SEND_QUEUE_SIZE,
+        overflow_policy: str = settings.WEBSOCKET_OVERFLOW_POLICY,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._on_close = on_close
+        self._queue: Deque[Tuple[Hashable, str]] = deque()
+        self._ready = asyncio.Event()
+        self._closing = False
+        self._close_task: Optional[asyncio.Task] = None
+        self._task = asyncio.create_task(self._run())
+    
+    def enqueue(self, text: str, key: Hashable = None) -> bool:
+        """
+        Queue a serialized message without blocking.
+        
+        Returns:
+            False if the message was not queued (connection closing)
+        """
+        if self._closing:
+            return False
+        
+        if len(self._queue) >= self.max_queue:
+            if self.overflow_policy == "disconnect":
+                self._slow_consumer()
+                return False
+            self._evict(key)
+        
+        self._queue.append((key, text))
+        self._ready.set()
+        return True
+    
+    def _evict(self, key: Hashable) -> None:
+        self.dropped += 1
+        if self.overflow_policy == "coalesce" and key is not None:
+            for queued in self._queue:
+                if queued[0] == key:
+                    self._queue.remove(queued)
+                    return
+        self._queue.popleft()
+    
+    def _slow_consumer(self) -> None:
+        self._closing = True
+        self._queue.clear()
+        self._on_close()
+        self._task.cancel()
+        self._close_task = asyncio.create_task(self._close_socket(code=1013, reason="Client too slow"))
+    
+    async def _close_socket(self, code: int, reason: str) -> None:
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+    
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            
+            _, text = self._queue.popleft()
+            try:
+                await self.websocket.send_text(text)
+            except Exception as e:
+                print(f"Error sending message: {e}")
+                self._closing = True
+                self._on_close()
+                return
+    
+    def close(self) -> None:
+        """Stop the writer; queued messages are discarded."""
+        self._closing = True
+        self._queue.clear()
+        if not self._task.done():
+            self._task.cancel()
+
 
 class ConnectionManager:
     """
@@ -15,11 +132,106 @@ class ConnectionManager:
     - Per-account subscriptions
     - Broadcasting to multiple clients
     - Connection lifecycle management
+    - Fan-out across API processes through Redis pub/sub
+    
+    With the Redis broker, `send_*` publishes to the account's channel and
+    every process subscribed to it (those holding sockets for the account)
+    delivers to its local connections. Without it, delivery is local only.
     """
     
-    def __init__(self):
+    def __init__(self, redis_url: Optional[str] = None):
         # Dictionary mapping account_id to set of websocket connections
         self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self._writers: Dict[WebSocket, ConnectionWriter] = {}
+        
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+        # Accounts whose channel subscribe failed: served by local delivery
+        self._local_only: Set[str] = set()
+        self._pending: Set[asyncio.Task] = set()
+    
+    async def start(self):
+        """Connect to the Redis broker and start relaying published updates."""
+        if not self.redis_url or self._redis is not None:
+            return
+        
+        try:
+            client = redis.from_url(self.redis_url)
+            await client.ping()
+        except Exception as e:
+            print(f"Warning: Redis broker unavailable, WebSocket updates stay local: {e}")
+            return
+        
+        self._redis = client
+        self._pubsub = client.pubsub()
+        
+        # Sockets accepted before the broker came up
+        channels = [CHANNEL_PREFIX + account_id for account_id in self.active_connections]
+        if channels:
+            try:
+                await self._pubsub.subscribe(*channels)
+                self._subscribed.set()
+            except Exception as e:
+                print(f"Warning: Could not subscribe existing sockets, their updates stay local: {e}")
+                self._local_only.update(self.active_connections)
+        
+        self._listener = asyncio.create_task(self._listen())
+    
+    async def stop(self):
+        """Stop relaying and close the Redis connections."""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        
+        if self._pubsub is not None:
+            await self._pubsub.close()
+            self._pubsub = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+    
+    async def _listen(self):
+        # The pub/sub connection only exists after the first subscribe
+        await self._subscribed.wait()
+        
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: Redis broker connection lost: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            
+            if message is None:
+                continue
+            
+            # One bad payload must not stop the relay
+            try:
+                channel = message["channel"].decode()
+                text = message["data"].decode()
+                self._deliver(text, _coalesce_key(json.loads(text)), channel[len(CHANNEL_PREFIX):])
+            except Exception as e:
+                print(f"Warning: Dropping undeliverable broker message: {e}")
+    
+    async def _unsubscribe(self, account_id: str):
+        # The account may have reconnected in the meantime
+        if account_id in self.active_connections or self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(CHANNEL_PREFIX + account_id)
+        except Exception as e:
+            print(f"Warning: Could not unsubscribe from account {account_id}: {e}")
         
     async def connect(self, websocket: WebSocket, account_id: str):
         """
@@ -33,8 +245,20 @@ class ConnectionManager:
         
         if account_id not in self.active_connections:
             self.active_connections[account_id] = set()
+            
+            # First local socket for the account: receive its updates
+            if self._pubsub is not None:
+                try:
+                    await self._pubsub.subscribe(CHANNEL_PREFIX + account_id)
+                    self._subscribed.set()
+                except Exception as e:
+                    print(f"Warning: Could not subscribe to account {account_id}, updates stay local: {e}")
+                    self._local_only.add(account_id)
         
         self.active_connections[account_id].add(websocket)
+        self._writers[websocket] = ConnectionWriter(
+            websocket, lambda: self.disconnect(websocket, account_id)
+        )
         
         # Send welcome message
         await self.send_personal_message(
@@ -54,21 +278,38 @@ class ConnectionManager:
             websocket: WebSocket connection to remove
             account_id: Account ID
         """
+        writer = self._writers.pop(websocket, None)
+        if writer is not None:
+            writer.close()
+        
         if account_id in self.active_connections:
             self.active_connections[account_id].discard(websocket)
             
             # Clean up empty sets
             if not self.active_connections[account_id]:
                 del self.active_connections[account_id]
+                self._local_only.discard(account_id)
+                
+                if self._pubsub is not None:
+                    task = asyncio.get_running_loop().create_task(self._unsubscribe(account_id))
+                    self._pending.add(task)
+                    task.add_done_callback(self._pending.discard)
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """
         Send message to a specific WebSocket connection.
         
+        Queued behind the connection's earlier messages when it has a writer.
+        
         Args:
             message: Message dictionary to send
             websocket: Target WebSocket connection
         """
+        writer = self._writers.get(websocket)
+        if writer is not None:
+            writer.enqueue(json.dumps(message, default=str))
+            return
+        
         try:
             await websocket.send_json(message)
         except Exception as e:
@@ -78,6 +319,9 @@ class ConnectionManager:
         """
         Broadcast message to all connections subscribed to an account.
         
+        The message is serialized once and queued on each connection's
+        writer, so this never waits on a client.
+        
         Args:
             message: Message dictionary to broadcast
             account_id: Target account ID
@@ -85,17 +329,39 @@ class ConnectionManager:
         if account_id not in self.active_connections:
             return
         
-        # Get all connections for this account
-        connections = list(self.active_connections[account_id])
+        self._deliver(json.dumps(message, default=str), _coalesce_key(message), account_id)
+    
+    def _deliver(self, text: str, key: Hashable, account_id: str):
+        # Copy: a "disconnect" overflow removes the connection mid-loop
+        for connection in list(self.active_connections.get(account_id, ())):
+            writer = self._writers.get(connection)
+            if writer is not None:
+                writer.enqueue(text, key)
+    
+    async def publish(self, message: dict, account_id: str):
+        """
+        Deliver a message to an account's subscribers on every API process.
         
-        # Send to all connections
-        for connection in connections:
+        Falls back to local delivery if the broker is not running or the
+        publish fails. Sockets whose account could not be subscribed get
+        local delivery as well.
+        
+        Args:
+            message: Message dictionary to send
+            account_id: Target account ID
+        """
+        if self._redis is not None:
             try:
-                await connection.send_json(message)
+                await self._redis.publish(
+                    CHANNEL_PREFIX + account_id, json.dumps(message, default=str)
+                )
             except Exception as e:
-                print(f"Error broadcasting to connection: {e}")
-                # Remove failed connection
-                self.disconnect(connection, account_id)
+                print(f"Warning: Redis publish failed, delivering locally: {e}")
+            else:
+                if account_id not in self._local_only:
+                    return
+        
+        await self.broadcast_to_account(message, account_id)
     
     async def send_order_update(self, account_id: str, order_data: dict):
         """
@@ -110,7 +376,7 @@ class ConnectionManager:
             "account_id": account_id,
             "data": order_data,
         }
-        await self.broadcast_to_account(message, account_id)
+        await self.publish(message, account_id)
     
     async def send_position_update(self, account_id: str, position_data: dict):
         """
@@ -125,7 +391,7 @@ class ConnectionManager:
             "account_id": account_id,
             "data": position_data,
         }
-        await self.broadcast_to_account(message, account_id)
+        await self.publish(message, account_id)
     
     async def send_balance_update(self, account_id: str, balance_data: dict):
         """
@@ -140,7 +406,7 @@ class ConnectionManager:
             "account_id": account_id,
             "data": balance_data,
         }
-        await self.broadcast_to_account(message, account_id)
+        await self.publish(message, account_id)
     
     async def send_pnl_update(self, account_id: str, pnl_data: dict):
         """
@@ -155,8 +421,10 @@ class ConnectionManager:
             "account_id": account_id,
             "data": pnl_data,
         }
-        await self.broadcast_to_account(message, account_id)
+        await self.publish(message, account_id)
 
 
 # Global connection manager instance
-manager = ConnectionManager()
+manager = ConnectionManager(
+    settings.REDIS_URL if settings.WEBSOCKET_BROKER == "redis" else None
+)
@@ -152,7 +152,7 @@ async def websocket_account_stream(
                 
                 # Handle ping/pong for keepalive
                 if data.get("type") == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    await manager.send_personal_message({"type": "pong"}, websocket)
                 
         except WebSocketDisconnect:
             # Client disconnected
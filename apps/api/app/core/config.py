@@ -17,6 +17,27 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    # "redis" fans WebSocket updates out across API processes; "local" keeps them in-process
+    WEBSOCKET_BROKER: str = Field(default="local", env="WEBSOCKET_BROKER")
+    # Per-connection outbound queue; overflow policy: drop_oldest | coalesce | disconnect
+    WEBSOCKET_SEND_QUEUE_SIZE: int = Field(default=256, env="WEBSOCKET_SEND_QUEUE_SIZE")
+    WEBSOCKET_OVERFLOW_POLICY: str = Field(default="drop_oldest", env="WEBSOCKET_OVERFLOW_POLICY")
+
+    # Market data
+    PRICE_CACHE_TTL_SECONDS: float = Field(default=1.0, env="PRICE_CACHE_TTL_SECONDS")
+    ORDER_TRIGGER_INTERVAL_SECONDS: float = Field(default=1.0, env="ORDER_TRIGGER_INTERVAL_SECONDS")
+    CLIENT_ORDER_ID_TTL_SECONDS: float = Field(default=300.0, env="CLIENT_ORDER_ID_TTL_SECONDS")
+    # Accounts whose seeded slippage model is kept in memory
+    SLIPPAGE_MODEL_CACHE_SIZE: int = Field(default=10000, env="SLIPPAGE_MODEL_CACHE_SIZE")
+
+    # Account actors (execution_mode="actor")
+    ACCOUNT_ACTOR_BATCH_SIZE: int = Field(default=50, env="ACCOUNT_ACTOR_BATCH_SIZE")
+    ACCOUNT_ACTOR_IDLE_SECONDS: float = Field(default=60.0, env="ACCOUNT_ACTOR_IDLE_SECONDS")
+
+    # Ledger checkpoints only cover entries older than this, so transactions
+    # still in flight cannot commit entries behind a checkpoint
+    LEDGER_CHECKPOINT_LAG_SECONDS: float = Field(default=300.0, env="LEDGER_CHECKPOINT_LAG_SECONDS")
+    LEDGER_EXPORT_CHUNK_SIZE: int = Field(default=5000, env="LEDGER_EXPORT_CHUNK_SIZE")
 
     # Security
     SECRET_KEY: str
@@ -21,6 +21,9 @@ from app.api.kyc import router as kyc_router
 from app.api.admin import router as admin_router
 from app.api.trading import router as trading_router
 from app.api.ws import router as ws_router
+from app.api.websocket import manager as websocket_manager
+from app.services.account_actor import account_actors
+from app.services.ticker import market_ticker
 
 app = FastAPI(
     title="OptCoin API",
@@ -50,6 +53,21 @@ app.add_middleware(
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 
+@app.on_event("startup")
+async def start_market_ticker():
+    """Rebuild resting orders, start evaluating price ticks and join the WebSocket broker."""
+    await market_ticker.start()
+    await websocket_manager.start()
+
+
+@app.on_event("shutdown")
+async def stop_market_ticker():
+    """Stop the price ticker, drain account actors and leave the WebSocket broker."""
+    await market_ticker.stop()
+    await account_actors.stop_all()
+    await websocket_manager.stop()
+
+
 @app.get("/")
 async def root():
     """Root endpoint - API information"""
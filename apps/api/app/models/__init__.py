@@ -3,10 +3,10 @@
 from .user import User
 from .account import Account
 from .instrument import Instrument
-from .candle import Candle
+from .candle import Candle, CandleRollupWatermark
 from .order import Order
 from .position import Position
-from .ledger_entry import LedgerEntry
+from .ledger_entry import LedgerEntry, LedgerCheckpoint
 from .bot import Bot
 from .backtest import Backtest
 from .bot_decision import BotDecision
@@ -31,9 +31,11 @@ __all__ = [
     "Account",
     "Instrument",
     "Candle",
+    "CandleRollupWatermark",
     "Order",
     "Position",
     "LedgerEntry",
+    "LedgerCheckpoint",
     "Bot",
     "Backtest",
     "BotDecision",
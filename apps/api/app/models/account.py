@@ -32,6 +32,10 @@ class Account(SQLModel, table=True):
     max_leverage: int = Field(default=10)
     max_daily_loss: Optional[Decimal] = Field(default=None, max_digits=20, decimal_places=2)
     
+    # Position handling
+    position_mode: str = Field(default="hedging", max_length=20)  # "hedging", "netting"
+    execution_mode: str = Field(default="direct", max_length=20)  # "direct", "actor"
+    
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID, uuid4
 from sqlalchemy import Column, JSON
@@ -20,6 +20,16 @@ class Backtest(SQLModel, table=True):
     # Parameters
     params: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
     
+    # Run mode
+    mode: str = Field(default="single", max_length=50)
+    # Modes: "single", "sweep", "walk_forward"
+    
+    # Parameter grid (name -> list of values) for "sweep" and "walk_forward"
+    param_grid: Optional[Dict[str, List[Any]]] = Field(default=None, sa_column=Column(JSON))
+    
+    # Walk-forward windows: in_sample_days, out_of_sample_days, anchored
+    walk_forward: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    
     # Date range
     start_date: datetime
     end_date: datetime
@@ -35,6 +45,12 @@ class Backtest(SQLModel, table=True):
     # Results (JSON containing metrics)
     metrics: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
     # Metrics: cagr, sharpe, max_drawdown, win_rate, total_trades, etc.
+    # Sweeps also store best_params and the ranked sweep_results table;
+    # walk-forward stores stitched out-of-sample metrics and walk_forward_windows
+    
+    # Monte Carlo trade-resampling risk report (percentiles of terminal equity,
+    # total return and max drawdown), only when simulations were requested
+    monte_carlo: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
     
     # Trade log reference (could be stored in S3/file system)
     trade_log_url: Optional[str] = Field(default=None, max_length=500)
@@ -5,7 +5,12 @@ from decimal import Decimal
 
 
 class Candle(SQLModel, table=True):
-    """OHLCV candlestick data for charts."""
+    """
+    OHLCV candlestick data for charts.
+    
+    Range-partitioned by month on `timestamp`; the primary key in the
+    database is (id, timestamp).
+    """
 
     __tablename__ = "candles"
 
@@ -38,3 +43,16 @@ class Candle(SQLModel, table=True):
                 "volume": 125.5,
             }
         }
+
+
+class CandleRollupWatermark(SQLModel, table=True):
+    """Progress of the 1m -> higher timeframe candle rollup."""
+
+    __tablename__ = "candle_rollup_watermarks"
+
+    instrument_id: UUID = Field(foreign_key="instruments.id", primary_key=True)
+    timeframe: str = Field(primary_key=True, max_length=10)
+    
+    # Every bucket starting before this has been rolled up from closed candles
+    watermark: datetime
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -7,7 +7,12 @@ from sqlalchemy import Column, JSON
 
 
 class LedgerEntry(SQLModel, table=True):
-    """Double-entry accounting ledger for all transactions."""
+    """
+    Double-entry accounting ledger for all transactions.
+    
+    Range-partitioned by month on `created_at`; the primary key in the
+    database is (id, created_at).
+    """
 
     __tablename__ = "ledger_entries"
 
@@ -47,3 +52,22 @@ class LedgerEntry(SQLModel, table=True):
                 "description": "Profit from BTC-USD position",
             }
         }
+
+
+class LedgerCheckpoint(SQLModel, table=True):
+    """Running ledger totals for an account up to a specific entry."""
+
+    __tablename__ = "ledger_checkpoints"
+
+    account_id: UUID = Field(foreign_key="accounts.id", primary_key=True)
+    
+    # Last entry covered, in (created_at, id) order
+    last_entry_id: UUID
+    last_entry_at: datetime
+    
+    # Totals over every entry up to and including the last one
+    entries_count: int = Field(default=0)
+    ledger_sum: Decimal = Field(default=Decimal("0"), max_digits=20, decimal_places=2)
+    balance_after: Decimal = Field(max_digits=20, decimal_places=2)
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -34,6 +34,9 @@ class Order(SQLModel, table=True):
     leverage: int = Field(default=1)
     margin_required: Decimal = Field(default=Decimal("0"), max_digits=20, decimal_places=8)
     
+    # Client-supplied idempotency key (unique per account)
+    client_order_id: Optional[str] = Field(default=None, max_length=64)
+    
     # Bot reference (if placed by bot)
     bot_id: Optional[UUID] = Field(default=None, foreign_key="bots.id")
     
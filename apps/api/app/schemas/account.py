@@ -14,6 +14,16 @@ class CreateAccountRequest(BaseModel):
     initial_balance: Optional[Decimal] = Field(default=Decimal("10000.00"), description="Initial balance")
     is_demo: bool = Field(default=True, description="Is this a demo account")
     max_leverage: int = Field(default=10, ge=1, le=100, description="Maximum leverage")
+    position_mode: str = Field(
+        default="hedging",
+        pattern="^(hedging|netting)$",
+        description="hedging: one position per fill; netting: one aggregated position per instrument and side",
+    )
+    execution_mode: str = Field(
+        default="direct",
+        pattern="^(direct|actor)$",
+        description="actor: serialize orders through a per-account writer with grouped commits",
+    )
     
     class Config:
         json_schema_extra = {
@@ -22,7 +32,9 @@ class CreateAccountRequest(BaseModel):
                 "base_currency": "USD",
                 "initial_balance": 10000.00,
                 "is_demo": True,
-                "max_leverage": 10
+                "max_leverage": 10,
+                "position_mode": "hedging",
+                "execution_mode": "direct"
             }
         }
 
@@ -41,6 +53,8 @@ class AccountResponse(BaseModel):
     is_active: bool
     max_leverage: int
     max_daily_loss: Optional[Decimal] = None
+    position_mode: str = "hedging"
+    execution_mode: str = "direct"
     created_at: datetime
     updated_at: datetime
     
@@ -60,6 +74,8 @@ class AccountResponse(BaseModel):
                 "is_active": True,
                 "max_leverage": 10,
                 "max_daily_loss": None,
+                "position_mode": "hedging",
+                "execution_mode": "direct",
                 "created_at": "2024-01-01T00:00:00Z",
                 "updated_at": "2024-01-15T12:30:00Z"
             }
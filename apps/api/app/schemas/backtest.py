@@ -1,11 +1,34 @@
 """Backtest schemas."""
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field, validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
 
 
+# Upper bound on parameter sweep size per backtest
+MAX_SWEEP_COMBINATIONS = 1000
+
+# Upper bound on Monte Carlo paths per backtest
+MAX_MONTE_CARLO_SIMULATIONS = 50000
+
+
+class WalkForwardConfig(BaseModel):
+    """Walk-forward optimization windows."""
+    in_sample_days: float = Field(..., gt=0, description="In-sample (optimization) window length in days")
+    out_of_sample_days: float = Field(..., gt=0, description="Out-of-sample (validation) window length in days; windows advance by this much")
+    anchored: bool = Field(default=False, description="Keep the in-sample start fixed (expanding window)")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "in_sample_days": 60,
+                "out_of_sample_days": 14,
+                "anchored": False
+            }
+        }
+
+
 class CreateBacktestRequest(BaseModel):
     """Request to create a backtest job."""
     strategy_id: str = Field(..., max_length=100, description="Strategy identifier (e.g., 'ema_crossover')")
@@ -14,6 +37,47 @@ class CreateBacktestRequest(BaseModel):
     start_date: datetime = Field(..., description="Backtest start date (UTC)")
     end_date: datetime = Field(..., description="Backtest end date (UTC)")
     initial_capital: float = Field(default=10000.0, gt=0, description="Initial capital")
+    timeframe: str = Field(default="1m", description="Candle timeframe (1m, 5m, 15m, 1h, 4h, 1d)")
+    param_grid: Optional[Dict[str, List[Any]]] = Field(
+        default=None,
+        description="Parameter sweep grid: parameter name -> values to try (runs every combination)",
+    )
+    walk_forward: Optional[WalkForwardConfig] = Field(
+        default=None,
+        description="Walk-forward mode: optimize param_grid per in-sample window, score out-of-sample",
+    )
+    monte_carlo_simulations: int = Field(
+        default=0,
+        ge=0,
+        le=MAX_MONTE_CARLO_SIMULATIONS,
+        description="Trade-resampling Monte Carlo paths to simulate after the backtest (0 = disabled)",
+    )
+    monte_carlo_seed: Optional[int] = Field(default=None, description="RNG seed for a reproducible Monte Carlo report")
+    
+    @validator('param_grid')
+    def validate_param_grid(cls, v):
+        """Validate the sweep grid is non-empty and bounded."""
+        if v is None:
+            return v
+        if not v:
+            raise ValueError('param_grid must contain at least one parameter')
+        combinations = 1
+        for name, values in v.items():
+            if not values:
+                raise ValueError(f'param_grid["{name}"] must contain at least one value')
+            combinations *= len(values)
+        if combinations > MAX_SWEEP_COMBINATIONS:
+            raise ValueError(
+                f'param_grid has {combinations} combinations (maximum {MAX_SWEEP_COMBINATIONS})'
+            )
+        return v
+    
+    @validator('walk_forward')
+    def validate_walk_forward(cls, v, values):
+        """Validate a parameter grid is provided for walk-forward optimization."""
+        if v is not None and not values.get('param_grid'):
+            raise ValueError('walk_forward requires a param_grid to optimize')
+        return v
     
     class Config:
         json_schema_extra = {
@@ -26,7 +90,13 @@ class CreateBacktestRequest(BaseModel):
                 },
                 "start_date": "2024-01-01T00:00:00Z",
                 "end_date": "2024-12-31T23:59:59Z",
-                "initial_capital": 10000.0
+                "initial_capital": 10000.0,
+                "timeframe": "1m",
+                "param_grid": {
+                    "fast_period": [10, 20, 30],
+                    "slow_period": [50, 100, 200]
+                },
+                "monte_carlo_simulations": 10000
             }
         }
 
@@ -38,12 +108,16 @@ class BacktestResponse(BaseModel):
     strategy_id: str
     instrument_id: UUID
     params: Dict[str, Any]
+    mode: str = "single"
+    param_grid: Optional[Dict[str, List[Any]]] = None
+    walk_forward: Optional[Dict[str, Any]] = None
     start_date: datetime
     end_date: datetime
     initial_capital: float
     status: str
     progress: float
     metrics: Optional[Dict[str, Any]] = None
+    monte_carlo: Optional[Dict[str, Any]] = None
     trade_log_url: Optional[str] = None
     error_message: Optional[str] = None
     task_id: Optional[str] = None
@@ -60,6 +134,9 @@ class BacktestResponse(BaseModel):
                 "strategy_id": "ema_crossover",
                 "instrument_id": "789e4567-e89b-12d3-a456-426614174000",
                 "params": {"fast_period": 20, "slow_period": 50},
+                "mode": "single",
+                "param_grid": None,
+                "walk_forward": None,
                 "start_date": "2024-01-01T00:00:00Z",
                 "end_date": "2024-12-31T23:59:59Z",
                 "initial_capital": 10000.0,
@@ -100,7 +100,9 @@ class CandlesRequest(BaseModel):
 class CandlesResponse(BaseModel):
     """Paginated candles response."""
     candles: List[CandleResponse]
-    total: int
+    total: Optional[int] = Field(default=None, description="Candles in range (only with count=estimate or count=exact)")
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next (older) page")
     symbol: str
     timeframe: str
     
@@ -109,6 +111,8 @@ class CandlesResponse(BaseModel):
             "example": {
                 "candles": [],
                 "total": 1440,
+                "total_is_estimate": False,
+                "next_cursor": "MTcwNDA2NzIwMA",
                 "symbol": "BTC-USD",
                 "timeframe": "1m"
             }
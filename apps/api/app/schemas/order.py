@@ -1,13 +1,17 @@
 """Order schemas."""
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
 from enum import Enum
 
 
+# Maximum orders accepted by the batch endpoint
+MAX_BATCH_ORDERS = 100
+
+
 class OrderType(str, Enum):
     """Order type enumeration."""
     MARKET = "market"
@@ -42,6 +46,12 @@ class CreateOrderRequest(BaseModel):
     price: Optional[Decimal] = Field(default=None, description="Limit price (required for limit orders)")
     stop_price: Optional[Decimal] = Field(default=None, description="Stop price (for stop orders)")
     leverage: int = Field(default=1, ge=1, le=100, description="Leverage multiplier")
+    client_order_id: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=64,
+        description="Idempotency key; resubmitting it returns the original order",
+    )
     
     @validator('price')
     def validate_price(cls, v, values):
@@ -68,7 +78,8 @@ class CreateOrderRequest(BaseModel):
                 "size": 0.5,
                 "price": None,
                 "stop_price": None,
-                "leverage": 1
+                "leverage": 1,
+                "client_order_id": "bot-7-000123"
             }
         }
 
@@ -90,6 +101,7 @@ class OrderResponse(BaseModel):
     commission: Decimal
     leverage: int
     margin_required: Decimal
+    client_order_id: Optional[str] = None
     bot_id: Optional[UUID] = None
     created_at: datetime
     filled_at: Optional[datetime] = None
@@ -114,6 +126,7 @@ class OrderResponse(BaseModel):
                 "commission": 5.00,
                 "leverage": 1,
                 "margin_required": 25000.00,
+                "client_order_id": None,
                 "bot_id": None,
                 "created_at": "2024-01-15T12:30:00Z",
                 "filled_at": "2024-01-15T12:30:01Z",
@@ -132,3 +145,25 @@ class CancelOrderRequest(BaseModel):
                 "order_id": "123e4567-e89b-12d3-a456-426614174000"
             }
         }
+
+
+class CreateOrdersBatchRequest(BaseModel):
+    """Request to place several orders at once."""
+    orders: List[CreateOrderRequest] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_ORDERS, description="Orders to place, executed in sequence"
+    )
+
+
+class BatchOrderResult(BaseModel):
+    """Outcome of one order in a batch."""
+    index: int
+    success: bool
+    order: Optional[OrderResponse] = None
+    error: Optional[str] = None
+
+
+class BatchOrderResponse(BaseModel):
+    """Per-order results of a batch placement."""
+    results: List[BatchOrderResult]
+    placed: int
+    failed: int
@@ -1,11 +1,27 @@
 """Business logic services."""
 
+from .account_actor import AccountActorRegistry, account_actors
 from .execution import ExecutionService
-from .ledger import LedgerService
+from .ledger import LedgerPosting, LedgerService
+from .order_book import OrderBook, order_book
 from .pnl import PnLCalculator
+from .position_triggers import PositionTriggerIndex, position_triggers
+from .price_cache import PriceCache, price_cache
+from .slippage_models import SlippageModelCache, slippage_models
 
 __all__ = [
+    "AccountActorRegistry",
+    "account_actors",
     "ExecutionService",
+    "LedgerPosting",
     "LedgerService",
+    "OrderBook",
+    "order_book",
     "PnLCalculator",
+    "PositionTriggerIndex",
+    "position_triggers",
+    "PriceCache",
+    "price_cache",
+    "SlippageModelCache",
+    "slippage_models",
 ]
@@ -0,0 +1,224 @@
+"""Single-writer execution actors for high-frequency accounts."""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.account import Account
+from app.models.instrument import Instrument
+from app.models.order import Order
+from app.services.client_orders import DuplicateClientOrderError, find_client_orders
+from app.services.execution import ExecutionService
+
+
+class AccountActor:
+    """
+    Serializes every order for one account through a single asyncio task.
+    
+    Queued orders are drained in batches: each batch locks the account row
+    once, executes its orders in sequence against the in-memory account, and
+    writes the account row, orders, positions and ledger entries in one
+    commit. Each order runs in its own savepoint, so an order that raises
+    fails only its own caller. Callers are answered once their batch is
+    durable.
+    
+    Order placement (single and batch) goes through the actor. Ticker fills
+    and SL/TP closes do not; they lock the account row first as well (see
+    `ExecutionService._lock_accounts`), and the actor keeps no account state
+    between batches.
+    """
+    
+    def __init__(self, account_id: UUID, registry: "AccountActorRegistry"):
+        self.account_id = account_id
+        self._registry = registry
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Finish queued orders and stop."""
+        if self._task:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+    
+    async def submit(self, order: Order) -> Dict[str, Any]:
+        """
+        Queue an order for execution.
+        
+        Args:
+            order: New, not yet persisted order for this account
+            
+        Returns:
+            Execution result (see `ExecutionService.execute_order`)
+            
+        Raises:
+            DuplicateClientOrderError: The order's client order ID was already used
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((order, future))
+        return await future
+    
+    async def submit_many(self, orders: List[Order]) -> List[Any]:
+        """
+        Queue several orders, in order, and wait for all of them.
+        
+        Args:
+            orders: New, not yet persisted orders for this account
+            
+        Returns:
+            Per order, its execution result or the exception it raised
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for order in orders:
+            future = loop.create_future()
+            await self._queue.put((order, future))
+            futures.append(future)
+        return await asyncio.gather(*futures, return_exceptions=True)
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                job = await asyncio.wait_for(
+                    self._queue.get(), timeout=settings.ACCOUNT_ACTOR_IDLE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if self._queue.empty() and self._registry.discard(self):
+                    return
+                continue
+            
+            batch = []
+            stopping = job is None
+            if job is not None:
+                batch.append(job)
+            
+            while len(batch) < settings.ACCOUNT_ACTOR_BATCH_SIZE and not self._queue.empty():
+                job = self._queue.get_nowait()
+                if job is None:
+                    stopping = True
+                    continue
+                batch.append(job)
+            
+            if batch:
+                await self._process(batch)
+            if stopping:
+                return
+    
+    async def _process(self, batch: List[Tuple[Order, asyncio.Future]]) -> None:
+        results = []
+        duplicates = []
+        failures = []
+        
+        async with async_session() as session:
+            try:
+                # One row lock per batch instead of one per order
+                account_result = await session.execute(
+                    select(Account)
+                    .where(Account.id == self.account_id)
+                    .with_for_update()
+                )
+                account = account_result.scalar_one()
+                
+                instrument_result = await session.execute(
+                    select(Instrument).where(
+                        Instrument.id.in_({order.instrument_id for order, _ in batch})
+                    )
+                )
+                instruments = {i.id: i for i in instrument_result.scalars().all()}
+                
+                # Also catches repeats queued within the same batch
+                existing = await find_client_orders(
+                    session, self.account_id, (order.client_order_id for order, _ in batch)
+                )
+                
+                execution_service = ExecutionService(session)
+                for order, future in batch:
+                    if order.client_order_id in existing:
+                        duplicates.append((future, existing[order.client_order_id]))
+                        continue
+                    
+                    try:
+                        async with session.begin_nested():
+                            session.add(order)
+                            result = await execution_service.execute_order(
+                                order, account, instruments[order.instrument_id]
+                            )
+                            # Make this fill's positions visible to the next order
+                            await session.flush()
+                    except Exception as e:
+                        print(f"Warning: Account actor order failed for {self.account_id}: {e}")
+                        failures.append((future, e))
+                        # The savepoint rollback expired the account's changes
+                        await session.refresh(account)
+                        continue
+                    
+                    if order.client_order_id:
+                        existing[order.client_order_id] = order
+                    results.append((future, result))
+                
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                print(f"Warning: Account actor batch failed for {self.account_id}: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        
+        for future, result in results:
+            if not future.done():
+                future.set_result(result)
+        for future, order in duplicates:
+            if not future.done():
+                future.set_exception(DuplicateClientOrderError(order))
+        for future, error in failures:
+            if not future.done():
+                future.set_exception(error)
+
+
+class AccountActorRegistry:
+    """Lazily started actors, one per active account."""
+    
+    def __init__(self):
+        self._actors: Dict[UUID, AccountActor] = {}
+    
+    def get(self, account_id: UUID) -> AccountActor:
+        """Actor for an account (started on first use)."""
+        actor = self._actors.get(account_id)
+        if actor is None:
+            actor = AccountActor(account_id, self)
+            self._actors[account_id] = actor
+            actor.start()
+        return actor
+    
+    async def submit(self, account_id: UUID, order: Order) -> Dict[str, Any]:
+        """Execute an order through its account's actor."""
+        return await self.get(account_id).submit(order)
+    
+    async def submit_many(self, account_id: UUID, orders: List[Order]) -> List[Any]:
+        """Execute several orders, in order, through their account's actor."""
+        return await self.get(account_id).submit_many(orders)
+    
+    def discard(self, actor: AccountActor) -> bool:
+        """Retire an idle actor (later orders start a fresh one)."""
+        if self._actors.get(actor.account_id) is actor:
+            del self._actors[actor.account_id]
+            return True
+        return False
+    
+    async def stop_all(self) -> None:
+        """Drain and stop every actor."""
+        actors = list(self._actors.values())
+        self._actors.clear()
+        await asyncio.gather(*(actor.stop() for actor in actors))
+
+
+# Global account actor registry
+account_actors = AccountActorRegistry()
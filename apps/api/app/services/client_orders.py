@@ -0,0 +1,98 @@
+"""Client order ID lookups for idempotent order placement."""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models.order import Order
+from app.schemas.order import OrderResponse
+
+
+class DuplicateClientOrderError(Exception):
+    """Raised when a client order ID was already used on the account."""
+    
+    def __init__(self, order: Order):
+        super().__init__(f"Duplicate client order ID: {order.client_order_id}")
+        self.order = order
+
+
+class ClientOrderCache:
+    """
+    Responses to recent submissions, keyed by (account, client_order_id).
+    
+    A retry inside the TTL is answered with the original response without
+    touching the database. Older duplicates fall through to the unique index
+    on `orders`, which stays the authority across processes.
+    """
+    
+    def __init__(self, ttl_seconds: float = settings.CLIENT_ORDER_ID_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[UUID, str], Tuple[OrderResponse, Optional[str], float]]" = OrderedDict()
+    
+    def get(self, account_id: UUID, client_order_id: str) -> Optional[Tuple[OrderResponse, Optional[str]]]:
+        """
+        Look up an earlier submission.
+        
+        Returns:
+            (original response, execution error or None), or None if not seen recently
+        """
+        self._expire()
+        entry = self._entries.get((account_id, client_order_id))
+        if entry is None:
+            return None
+        return entry[0], entry[1]
+    
+    def put(self, order: Order, error: Optional[str] = None) -> None:
+        """Remember the response to an order that carries a client order ID."""
+        if not order.client_order_id:
+            return
+        
+        key = (order.account_id, order.client_order_id)
+        self._entries.pop(key, None)
+        self._entries[key] = (OrderResponse.model_validate(order), error, time.monotonic())
+        self._expire()
+    
+    def _expire(self) -> None:
+        # Insertion order is expiry order, so only the front needs checking
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._entries:
+            _, _, seen_at = next(iter(self._entries.values()))
+            if seen_at >= cutoff:
+                break
+            self._entries.popitem(last=False)
+
+
+async def find_client_orders(
+    session: AsyncSession, account_id: UUID, client_order_ids: Iterable[str]
+) -> Dict[str, Order]:
+    """
+    Load existing orders for client order IDs on an account.
+    
+    Returns:
+        Orders keyed by client order ID (IDs not yet used are absent)
+    """
+    client_order_ids = {c for c in client_order_ids if c}
+    if not client_order_ids:
+        return {}
+    
+    result = await session.execute(
+        select(Order).where(
+            Order.account_id == account_id,
+            Order.client_order_id.in_(client_order_ids),
+        )
+    )
+    return {order.client_order_id: order for order in result.scalars().all()}
+
+
+def replay_error(order: Order) -> Optional[str]:
+    """Error to report again for a previously submitted order."""
+    return "Order was rejected" if order.status == "rejected" else None
+
+
+# Global client order ID cache
+client_orders = ClientOrderCache()
@@ -2,9 +2,8 @@
 
 from decimal import Decimal
 from datetime import datetime
-from typing import Dict, Any, Optional
-from uuid import uuid4
-import random
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
@@ -13,8 +12,18 @@ from app.models.instrument import Instrument
 from app.models.account import Account
 from app.models.order import Order
 from app.models.position import Position
-from app.models.candle import Candle
 from app.models.ledger_entry import LedgerEntry
+from app.services.order_book import (
+    LIMIT_ORDER_TYPES,
+    RESTING_ORDER_TYPES,
+    limit_level,
+    limit_reached,
+    order_book,
+    stop_reached,
+)
+from app.services.position_triggers import crossed_trigger, position_triggers
+from app.services.price_cache import price_cache
+from app.services.slippage_models import slippage_models
 
 
 class ExecutionService:
@@ -32,20 +41,33 @@ class ExecutionService:
     def __init__(self, session: AsyncSession):
         self.session = session
     
-    async def execute_order(self, order: Order, account: Account, instrument: Instrument) -> Dict[str, Any]:
+    async def execute_order(
+        self,
+        order: Order,
+        account: Account,
+        instrument: Instrument,
+        current_price: Optional[Decimal] = None,
+        triggered: bool = False,
+    ) -> Dict[str, Any]:
         """
         Execute a simulated order.
         
+        Limit and stop orders that the market has not reached yet are rested
+        in the order book instead and filled later by `process_price_tick`.
+        
         Args:
             order: Order to execute
             account: Account placing the order
             instrument: Instrument being traded
+            current_price: Market price to execute against (default: latest price)
+            triggered: Order was released by the order book and must fill now
             
         Returns:
             Execution result with fill details
         """
         # Get current market price from latest candle
-        current_price = await self._get_current_price(instrument.id)
+        if current_price is None:
+            current_price = await self._get_current_price(instrument.id)
         
         if current_price is None:
             order.status = "rejected"
@@ -56,15 +78,24 @@ class ExecutionService:
                 "error": "No market data available",
             }
         
+        # Rest limit/stop orders the market has not reached yet
+        if order.order_type in RESTING_ORDER_TYPES and not triggered:
+            fill_now, stop_triggered = self._check_trigger(order, current_price)
+            if not fill_now:
+                order_book.add(order, stop_triggered=stop_triggered)
+                return {
+                    "success": True,
+                    "resting": True,
+                    "order_id": str(order.id),
+                }
+        
         # Calculate fill price based on order type
         fill_price = await self._calculate_fill_price(
             order, instrument, current_price
         )
         
         # Calculate slippage
-        slippage = self._calculate_slippage(
-            order.order_type, order.size, instrument
-        )
+        slippage = self._calculate_slippage(order, instrument)
         
         # Apply slippage to fill price
         if order.side == "buy":
@@ -101,7 +132,13 @@ class ExecutionService:
         self.session.add(order)
         
         # Create or update position
-        position = await self._handle_position(order, account, instrument, fill_price)
+        if account.position_mode == "netting":
+            position, opened_size = await self._net_position(order, account, instrument, fill_price)
+            # Only the size that adds exposure ties up new margin
+            margin_required = (opened_size * fill_price) / order.leverage
+            order.margin_required = margin_required
+        else:
+            position = await self._handle_position(order, account, instrument, fill_price)
         
         # Update account balances
         account.margin_used += margin_required
@@ -141,20 +178,273 @@ class ExecutionService:
             "margin_required": float(margin_required),
         }
     
-    async def _get_current_price(self, instrument_id) -> Optional[Decimal]:
-        """Get the latest price from candle data."""
+    async def close_position(
+        self,
+        position: Position,
+        account: Account,
+        exit_price: Decimal,
+        close_size: Optional[Decimal] = None,
+        reason: Optional[str] = None,
+        order_id: Optional[UUID] = None,
+    ) -> Decimal:
+        """
+        Close a position (fully or partially) and book the realized P&L.
+        
+        Args:
+            position: Open position
+            account: Account owning the position
+            exit_price: Price the position is closed at
+            close_size: Size to close (default: whole position)
+            reason: Close trigger recorded in the ledger (e.g. "stop_loss")
+            order_id: Order whose fill closes the position (optional)
+            
+        Returns:
+            Realized P&L
+        """
+        close_size = close_size or position.size
+        now = datetime.utcnow()
+        
+        # Calculate partial P&L
+        pnl_ratio = close_size / position.size
+        realized_pnl = self._calculate_position_pnl(position, exit_price) * pnl_ratio
+        
+        # Update account balance
+        account.balance += realized_pnl
+        account.margin_used -= (position.margin_used * pnl_ratio)
+        account.margin_available += (position.margin_used * pnl_ratio)
+        account.equity = account.balance + account.margin_used
+        account.updated_at = now
+        self.session.add(account)
+        
+        # Create ledger entry
+        meta = {
+            "entry_price": float(position.entry_price),
+            "exit_price": float(exit_price),
+            "size": float(close_size),
+            "pnl": float(realized_pnl),
+        }
+        if reason:
+            meta["reason"] = reason
+        
+        ledger_entry = LedgerEntry(
+            id=uuid4(),
+            account_id=account.id,
+            entry_type="trade_pnl",
+            amount=realized_pnl,
+            balance_after=account.balance,
+            currency=account.base_currency,
+            order_id=order_id,
+            position_id=position.id,
+            description=f"P&L from closing position {position.id}",
+            meta=meta,
+            created_at=now,
+        )
+        self.session.add(ledger_entry)
+        
+        # Update or close position
+        position.current_price = exit_price
+        if close_size >= position.size:
+            # Full close
+            position.is_open = False
+            position.closed_at = now
+            position.realized_pnl = realized_pnl
+            position.unrealized_pnl = 0
+            position_triggers.remove(position.id)
+        else:
+            # Partial close
+            position.size -= close_size
+            position.margin_used -= (position.margin_used * pnl_ratio)
+            position.realized_pnl += realized_pnl
+            position.unrealized_pnl -= realized_pnl
+        
+        position.updated_at = now
+        self.session.add(position)
+        
+        return realized_pnl
+    
+    async def process_position_triggers(self, instrument_id, price: Decimal) -> List[Dict[str, Any]]:
+        """
+        Close positions whose stop loss or take profit a new price crosses.
+        
+        Only crossed positions are returned by the trigger index; they and
+        their accounts are loaded with one query each and closed in the
+        caller's transaction. The index may hold levels another process has
+        since edited, so each locked row's own stop loss / take profit
+        decides whether it closes. Open positions that are not closed (row
+        locked elsewhere, or levels no longer crossed) are watched again.
+        
+        Args:
+            instrument_id: Instrument the price belongs to
+            price: New market price
+            
+        Returns:
+            Closed positions with their trigger and realized P&L
+        """
+        triggered = dict(position_triggers.match(instrument_id, price))
+        if not triggered:
+            return []
+        
+        owners = await self.session.execute(
+            select(Position.account_id)
+            .where(Position.id.in_(list(triggered)))
+            .where(Position.is_open == True)
+            .distinct()
+        )
+        accounts = await self._lock_accounts(owners.scalars().all())
+        
         result = await self.session.execute(
-            select(Candle)
-            .where(Candle.instrument_id == instrument_id)
-            .where(Candle.timeframe == "1m")
-            .order_by(Candle.timestamp.desc())
-            .limit(1)
+            select(Position)
+            .where(Position.id.in_(list(triggered)))
+            .where(Position.is_open == True)
+            .with_for_update(skip_locked=True)
         )
-        candle = result.scalar_one_or_none()
+        locked = result.scalars().all()
+        positions = []
+        for position in locked:
+            reason = crossed_trigger(position.side, position.stop_loss, position.take_profit, price)
+            if reason is None:
+                # Levels were moved away from the price: watch the current ones
+                position_triggers.add(position)
+                continue
+            triggered[position.id] = reason
+            positions.append(position)
         
-        if candle:
-            return candle.close
-        return None
+        skipped = set(triggered) - {position.id for position in locked}
+        if skipped:
+            still_open = await self.session.execute(
+                select(Position.id)
+                .where(Position.id.in_(skipped))
+                .where(Position.is_open == True)
+            )
+            position_triggers.release(still_open.scalars().all())
+        if not positions:
+            return []
+        
+        closed = []
+        for position in positions:
+            reason = triggered[position.id]
+            realized_pnl = await self.close_position(
+                position, accounts[position.account_id], price, reason=reason
+            )
+            closed.append({
+                "position_id": str(position.id),
+                "reason": reason,
+                "exit_price": float(price),
+                "realized_pnl": float(realized_pnl),
+            })
+        
+        return closed
+    
+    async def process_price_tick(self, instrument_id, price: Decimal) -> List[Dict[str, Any]]:
+        """
+        Fill resting orders that a new price reaches.
+        
+        The order book hands back only the crossed orders, which are then
+        loaded and executed in one pass. Orders no longer pending are
+        dropped; pending orders whose row another transaction holds go back
+        into the book. The caller settles or releases the rest of the
+        in-flight orders once it knows whether its transaction committed.
+        
+        Args:
+            instrument_id: Instrument the price belongs to
+            price: New market price
+            
+        Returns:
+            Execution results of the filled orders
+        """
+        order_ids = order_book.match(instrument_id, price)
+        if not order_ids:
+            return []
+        
+        owners = await self.session.execute(
+            select(Order.account_id)
+            .where(Order.id.in_(order_ids))
+            .where(Order.status == "pending")
+            .distinct()
+        )
+        accounts = await self._lock_accounts(owners.scalars().all())
+        
+        result = await self.session.execute(
+            select(Order)
+            .where(Order.id.in_(order_ids))
+            .where(Order.status == "pending")
+            .with_for_update(skip_locked=True)
+        )
+        orders = result.scalars().all()
+        
+        skipped = set(order_ids) - {order.id for order in orders}
+        if skipped:
+            still_pending = await self.session.execute(
+                select(Order.id)
+                .where(Order.id.in_(skipped))
+                .where(Order.status == "pending")
+            )
+            order_book.release(still_pending.scalars().all())
+        if not orders:
+            return []
+        
+        instrument = await self.session.get(Instrument, instrument_id)
+        
+        results = []
+        for order in orders:
+            results.append(
+                await self.execute_order(
+                    order,
+                    accounts[order.account_id],
+                    instrument,
+                    current_price=price,
+                    triggered=True,
+                )
+            )
+        
+        return results
+    
+    async def _lock_accounts(self, account_ids) -> Dict[UUID, Account]:
+        """
+        Lock accounts FOR UPDATE in ID order, before their orders or positions.
+        
+        Ticker fills and SL/TP closes write actor accounts (execution_mode
+        "actor") without going through the actor. That is safe because the
+        actor also locks the account row first and reloads it for every
+        batch, so the two serialize on the row lock and neither works from a
+        stale balance. Taking account locks first and in a fixed order keeps
+        ticks from deadlocking against actor batches and other ticks.
+        
+        Returns:
+            Locked accounts by ID
+        """
+        if not account_ids:
+            return {}
+        
+        result = await self.session.execute(
+            select(Account)
+            .where(Account.id.in_(set(account_ids)))
+            .order_by(Account.id)
+            .with_for_update()
+        )
+        return {account.id: account for account in result.scalars().all()}
+    
+    def _check_trigger(self, order: Order, current_price: Decimal) -> Tuple[bool, bool]:
+        """
+        Check a limit/stop order against the market.
+        
+        Returns:
+            (fill now, stop already triggered)
+        """
+        if order.order_type in LIMIT_ORDER_TYPES:
+            return limit_reached(order.side, limit_level(order), current_price), False
+        
+        if not stop_reached(order.side, order.stop_price, current_price):
+            return False, False
+        
+        if order.order_type == "stop_limit":
+            return limit_reached(order.side, order.price, current_price), True
+        
+        return True, True
+    
+    async def _get_current_price(self, instrument_id) -> Optional[Decimal]:
+        """Get the latest price from the shared price cache."""
+        return await price_cache.get_price(self.session, instrument_id)
     
     async def _calculate_fill_price(
         self, order: Order, instrument: Instrument, current_price: Decimal
@@ -168,43 +458,37 @@ class ExecutionService:
             else:
                 return current_price - spread_amount
         
-        elif order.order_type == "limit":
-            # Limit orders fill at limit price if market reached it
-            # For simulation, we assume it's reached
-            return order.price
+        elif order.order_type in LIMIT_ORDER_TYPES or order.order_type == "stop_limit":
+            # Limit orders only execute once the market reached the limit
+            return limit_level(order)
         
-        elif order.order_type in ["stop", "stop_limit"]:
-            # Stop orders fill at stop price (simplified)
-            return order.stop_price or current_price
+        elif order.order_type == "stop":
+            # Triggered stops execute as market orders
+            spread_amount = current_price * instrument.base_spread
+            if order.side == "buy":
+                return current_price + spread_amount
+            else:
+                return current_price - spread_amount
         
         else:
             # Default to current price
             return current_price
     
-    def _calculate_slippage(
-        self, order_type: str, size: Decimal, instrument: Instrument
-    ) -> Decimal:
+    def _calculate_slippage(self, order: Order, instrument: Instrument) -> Decimal:
         """
         Calculate slippage based on order size and instrument.
         
-        Slippage increases with order size.
+        Slippage increases with order size. The random component comes from
+        the account's seeded model (see `SlippageModelCache`).
         """
-        if order_type == "limit":
+        if order.order_type in ("limit", "stop_limit", "take_profit"):
             # Limit orders have no slippage (executed at limit price)
             return Decimal("0")
         
-        # Base slippage from instrument
-        base_slippage = instrument.slippage_factor
+        model = slippage_models.get(order.account_id, order.id)
+        micros = model.sample_one_micros(float(order.size), float(instrument.slippage_factor))
         
-        # Size-based slippage (larger orders = more slippage)
-        # Add random component for realism
-        size_factor = float(size) * 0.001  # 0.1% per unit size
-        random_factor = random.uniform(-0.0002, 0.0002)  # ±0.02%
-        
-        total_slippage = float(base_slippage) + size_factor + random_factor
-        
-        # Cap slippage at 1%
-        return Decimal(str(min(max(total_slippage, 0), 0.01)))
+        return Decimal(micros).scaleb(-6)
     
     def _calculate_commission(
         self, size: Decimal, price: Decimal, instrument: Instrument
@@ -225,10 +509,10 @@ class ExecutionService:
         self, order: Order, account: Account, instrument: Instrument, fill_price: Decimal
     ) -> Optional[Position]:
         """
-        Create a new position or update existing one.
+        Create a new position or update existing one (hedging mode).
         
-        For simplicity, we create a new position for each order.
-        In a full implementation, this would aggregate positions.
+        Each order opens its own position; accounts in netting mode use
+        `_net_position` instead.
         """
         # Check if there's an existing opposite position to close
         opposite_side = "short" if order.side == "buy" else "long"
@@ -251,6 +535,7 @@ class ExecutionService:
             
             existing_position.is_open = False
             existing_position.closed_at = datetime.utcnow()
+            position_triggers.remove(existing_position.id)
             existing_position.realized_pnl = pnl
             existing_position.updated_at = datetime.utcnow()
             self.session.add(existing_position)
@@ -294,6 +579,70 @@ class ExecutionService:
             order, account, instrument, fill_price, order.size
         )
     
+    async def _net_position(
+        self, order: Order, account: Account, instrument: Instrument, fill_price: Decimal
+    ) -> Tuple[Optional[Position], Decimal]:
+        """
+        Apply a fill to the account's aggregated positions (netting mode).
+        
+        Opposite positions are reduced first, oldest first and partially if
+        needed; any remaining size is added to the single same-side position
+        at a volume-weighted entry price.
+        
+        Returns:
+            (resulting position, size that opened or increased exposure)
+        """
+        side = "long" if order.side == "buy" else "short"
+        
+        result = await self.session.execute(
+            select(Position)
+            .where(Position.account_id == account.id)
+            .where(Position.instrument_id == order.instrument_id)
+            .where(Position.is_open == True)
+            .order_by(Position.opened_at)
+        )
+        positions = result.scalars().all()
+        
+        # Reduce opposite exposure
+        remaining = order.size
+        position = None
+        for opposite in positions:
+            if remaining <= 0:
+                break
+            if opposite.side == side:
+                continue
+            
+            close_size = min(remaining, opposite.size)
+            await self.close_position(
+                opposite, account, fill_price, close_size, order_id=order.id
+            )
+            remaining -= close_size
+            position = opposite
+        
+        if remaining <= 0:
+            return position, Decimal("0")
+        
+        # Add the rest to the aggregated same-side position
+        existing = next((p for p in positions if p.side == side and p.is_open), None)
+        if existing is None:
+            position = await self._create_position(
+                order, account, instrument, fill_price, remaining
+            )
+            return position, remaining
+        
+        total_size = existing.size + remaining
+        existing.entry_price = (
+            existing.entry_price * existing.size + fill_price * remaining
+        ) / total_size
+        existing.size = total_size
+        existing.margin_used += (remaining * fill_price) / order.leverage
+        existing.current_price = fill_price
+        existing.unrealized_pnl = self._calculate_position_pnl(existing, fill_price)
+        existing.updated_at = datetime.utcnow()
+        self.session.add(existing)
+        
+        return existing, remaining
+    
     async def _create_position(
         self, order: Order, account: Account, instrument: Instrument,
         fill_price: Decimal, size: Decimal
@@ -1,15 +1,127 @@
 """Ledger and accounting service."""
 
+import csv
+import io
+import json
+from dataclasses import dataclass, field
 from decimal import Decimal
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Dict, Any, Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import func, insert, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.core.config import settings
+from app.core.database import async_session
 from app.models.account import Account
-from app.models.ledger_entry import LedgerEntry
+from app.models.ledger_entry import LedgerEntry, LedgerCheckpoint
+
+
+# Rows per multi-row INSERT (asyncpg allows at most 32767 bind parameters)
+POST_BATCH_INSERT_ROWS = 1000
+
+
+@dataclass
+class LedgerPosting:
+    """One entry to post with `LedgerService.post_batch`."""
+    account_id: UUID
+    entry_type: str
+    amount: Decimal
+    currency: str = "USD"
+    order_id: Optional[UUID] = None
+    position_id: Optional[UUID] = None
+    description: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+# Columns written by ledger exports, in order
+EXPORT_COLUMNS = (
+    "id",
+    "account_id",
+    "entry_type",
+    "amount",
+    "balance_after",
+    "currency",
+    "order_id",
+    "position_id",
+    "description",
+    "meta",
+    "created_at",
+)
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _json_default(value: Any) -> str:
+    """Encode ledger values JSON has no type for (UUIDs, decimals, timestamps)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    """CSV cell for a ledger value (metadata as JSON, ISO timestamps)."""
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+# Advance each account's checkpoint over the entries recorded since it, up to
+# the cutoff. Each account reads only its own tail via the
+# (account_id, created_at, id) index.
+CHECKPOINT_QUERY = text(
+    """
+    WITH tails AS (
+        SELECT accounts.id AS account_id,
+               tail.entries_count, tail.ledger_sum,
+               last_entry.id AS last_entry_id,
+               last_entry.created_at AS last_entry_at,
+               last_entry.balance_after
+        FROM accounts
+        LEFT JOIN ledger_checkpoints ON ledger_checkpoints.account_id = accounts.id
+        JOIN LATERAL (
+            SELECT count(*) AS entries_count, coalesce(sum(amount), 0) AS ledger_sum
+            FROM ledger_entries
+            WHERE ledger_entries.account_id = accounts.id
+              AND (ledger_entries.created_at, ledger_entries.id) > (
+                  coalesce(ledger_checkpoints.last_entry_at, '-infinity'::timestamp),
+                  coalesce(ledger_checkpoints.last_entry_id, '00000000-0000-0000-0000-000000000000'::uuid)
+              )
+              AND ledger_entries.created_at < :cutoff
+        ) AS tail ON tail.entries_count > 0
+        JOIN LATERAL (
+            SELECT id, created_at, balance_after
+            FROM ledger_entries
+            WHERE ledger_entries.account_id = accounts.id
+              AND ledger_entries.created_at < :cutoff
+            ORDER BY created_at DESC, id DESC
+            LIMIT 1
+        ) AS last_entry ON true
+        WHERE CAST(:account_id AS uuid) IS NULL OR accounts.id = CAST(:account_id AS uuid)
+    )
+    INSERT INTO ledger_checkpoints (
+        account_id, last_entry_id, last_entry_at,
+        entries_count, ledger_sum, balance_after, created_at
+    )
+    SELECT account_id, last_entry_id, last_entry_at,
+           entries_count, ledger_sum, balance_after, :now
+    FROM tails
+    ON CONFLICT (account_id) DO UPDATE SET
+        last_entry_id = EXCLUDED.last_entry_id,
+        last_entry_at = EXCLUDED.last_entry_at,
+        entries_count = ledger_checkpoints.entries_count + EXCLUDED.entries_count,
+        ledger_sum = ledger_checkpoints.ledger_sum + EXCLUDED.ledger_sum,
+        balance_after = EXCLUDED.balance_after,
+        created_at = EXCLUDED.created_at
+    RETURNING account_id
+    """
+)
 
 
 class LedgerService:
@@ -85,6 +197,79 @@ class LedgerService:
         
         return entry
     
+    async def post_batch(self, postings: List[LedgerPosting]) -> List[LedgerEntry]:
+        """
+        Post many ledger entries at once.
+        
+        Every involved account is locked once, in account ID order so that
+        concurrent batches cannot deadlock. Running balances are computed in
+        memory in posting order and the entries are written with multi-row
+        INSERTs, so the statement count does not grow with the batch.
+        
+        Args:
+            postings: Entries to post, applied in order
+            
+        Returns:
+            Posted ledger entries, in posting order
+            
+        Raises:
+            ValueError: A posting references an unknown account
+        """
+        if not postings:
+            return []
+        
+        # Write pending changes first; the locked rows are reloaded below
+        await self.session.flush()
+        
+        account_ids = sorted({p.account_id for p in postings}, key=str)
+        result = await self.session.execute(
+            select(Account)
+            .where(Account.id.in_(account_ids))
+            .order_by(Account.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        accounts = {account.id: account for account in result.scalars().all()}
+        
+        missing = [str(account_id) for account_id in account_ids if account_id not in accounts]
+        if missing:
+            raise ValueError(f"Accounts not found: {', '.join(missing)}")
+        
+        # Strictly increasing timestamps keep (created_at, id) in posting order,
+        # which checkpoints and reconciliation rely on to find the last entry
+        now = datetime.utcnow()
+        entries = []
+        for i, posting in enumerate(postings):
+            account = accounts[posting.account_id]
+            account.balance += posting.amount
+            entries.append(
+                LedgerEntry(
+                    id=uuid4(),
+                    account_id=posting.account_id,
+                    entry_type=posting.entry_type,
+                    amount=posting.amount,
+                    balance_after=account.balance,
+                    currency=posting.currency,
+                    order_id=posting.order_id,
+                    position_id=posting.position_id,
+                    description=posting.description or f"{posting.entry_type.replace('_', ' ').title()}",
+                    meta=posting.meta,
+                    created_at=now + timedelta(microseconds=i),
+                )
+            )
+        
+        rows = [entry.model_dump() for entry in entries]
+        for start in range(0, len(rows), POST_BATCH_INSERT_ROWS):
+            await self.session.execute(
+                insert(LedgerEntry).values(rows[start:start + POST_BATCH_INSERT_ROWS])
+            )
+        
+        for account in accounts.values():
+            account.updated_at = now
+            self.session.add(account)
+        
+        return entries
+    
     async def get_entries(
         self,
         account_id: UUID,
@@ -118,10 +303,80 @@ class LedgerService:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    async def export_entries(
+        self,
+        account_id: Optional[UUID] = None,
+        export_format: str = "csv",
+    ) -> AsyncIterator[str]:
+        """
+        Stream ledger entries oldest first as CSV or NDJSON.
+        
+        Rows are read through a server-side cursor `LEDGER_EXPORT_CHUNK_SIZE`
+        at a time and written out chunk by chunk, so memory stays flat
+        regardless of history length.
+        
+        Args:
+            account_id: Only export this account (default: every account)
+            export_format: "csv" or "ndjson"
+            
+        Yields:
+            Encoded text, one chunk of rows at a time
+        """
+        if export_format not in EXPORT_MEDIA_TYPES:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        
+        query = select(*(getattr(LedgerEntry, column) for column in EXPORT_COLUMNS))
+        if account_id:
+            query = query.where(LedgerEntry.account_id == account_id)
+        query = query.order_by(LedgerEntry.created_at, LedgerEntry.id)
+        
+        result = await self.session.stream(
+            query.execution_options(yield_per=settings.LEDGER_EXPORT_CHUNK_SIZE)
+        )
+        
+        if export_format == "csv":
+            yield ",".join(EXPORT_COLUMNS) + "\r\n"
+        
+        async for rows in result.partitions():
+            buffer = io.StringIO()
+            if export_format == "csv":
+                writer = csv.writer(buffer)
+                for row in rows:
+                    writer.writerow(_csv_value(value) for value in row)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+    
+    async def create_checkpoints(self, account_id: Optional[UUID] = None) -> int:
+        """
+        Advance ledger checkpoints to cover entries older than the checkpoint lag.
+        
+        Args:
+            account_id: Only checkpoint this account (default: every account)
+            
+        Returns:
+            Number of checkpoints advanced
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            CHECKPOINT_QUERY,
+            {
+                "account_id": account_id,
+                "cutoff": now - timedelta(seconds=settings.LEDGER_CHECKPOINT_LAG_SECONDS),
+                "now": now,
+            },
+        )
+        return len(result.fetchall())
+    
     async def reconcile_account(self, account_id: UUID) -> Dict[str, Any]:
         """
         Reconcile an account by verifying ledger entries sum to current balance.
         
+        Only entries after the account's latest checkpoint are read, and they
+        are aggregated in SQL.
+        
         Args:
             account_id: Account ID
             
@@ -137,15 +392,30 @@ class LedgerService:
         if not account:
             raise ValueError(f"Account {account_id} not found")
         
-        # Get all ledger entries
-        entries_result = await self.session.execute(
-            select(LedgerEntry)
+        checkpoint = await self.session.get(LedgerCheckpoint, account_id)
+        
+        # Entries recorded since the checkpoint
+        tail_query = select(
+            func.count(LedgerEntry.id),
+            func.coalesce(func.sum(LedgerEntry.amount), 0),
+        ).where(LedgerEntry.account_id == account_id)
+        last_query = (
+            select(LedgerEntry.balance_after)
             .where(LedgerEntry.account_id == account_id)
-            .order_by(LedgerEntry.created_at)
+            .order_by(LedgerEntry.created_at.desc(), LedgerEntry.id.desc())
+            .limit(1)
         )
-        entries = entries_result.scalars().all()
+        if checkpoint:
+            after_checkpoint = tuple_(LedgerEntry.created_at, LedgerEntry.id) > tuple_(
+                checkpoint.last_entry_at, checkpoint.last_entry_id
+            )
+            tail_query = tail_query.where(after_checkpoint)
+            last_query = last_query.where(after_checkpoint)
+        
+        tail_count, tail_sum = (await self.session.execute(tail_query)).one()
+        entries_count = tail_count + (checkpoint.entries_count if checkpoint else 0)
         
-        if not entries:
+        if not entries_count:
             return {
                 "reconciled": True,
                 "account_balance": float(account.balance),
@@ -155,10 +425,13 @@ class LedgerService:
             }
         
         # Calculate sum of all entries
-        ledger_sum = sum(entry.amount for entry in entries)
+        ledger_sum = Decimal(tail_sum) + (checkpoint.ledger_sum if checkpoint else Decimal("0"))
         
         # The last entry's balance_after should equal current account balance
-        last_entry_balance = entries[-1].balance_after if entries else Decimal("0")
+        if tail_count:
+            last_entry_balance = (await self.session.execute(last_query)).scalar_one()
+        else:
+            last_entry_balance = checkpoint.balance_after
         
         discrepancy = account.balance - last_entry_balance
         is_reconciled = abs(discrepancy) < Decimal("0.01")  # Allow 1 cent tolerance
@@ -169,5 +442,20 @@ class LedgerService:
             "ledger_balance": float(last_entry_balance),
             "ledger_sum": float(ledger_sum),
             "discrepancy": float(discrepancy),
-            "entries_count": len(entries),
+            "entries_count": entries_count,
+            "checkpoint_at": checkpoint.last_entry_at.isoformat() if checkpoint else None,
         }
+
+
+async def stream_ledger_export(
+    account_id: Optional[UUID] = None, export_format: str = "csv"
+) -> AsyncIterator[str]:
+    """
+    Ledger export on its own session, for streaming responses.
+    
+    The session lives exactly as long as the stream, independent of the
+    request's session.
+    """
+    async with async_session() as session:
+        async for chunk in LedgerService(session).export_entries(account_id, export_format):
+            yield chunk
@@ -0,0 +1,290 @@
+"""In-memory book of resting limit/stop orders."""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.order import Order
+
+
+# Order types that wait in the book until the market reaches them
+LIMIT_ORDER_TYPES = ("limit", "take_profit")
+STOP_ORDER_TYPES = ("stop", "stop_limit")
+RESTING_ORDER_TYPES = LIMIT_ORDER_TYPES + STOP_ORDER_TYPES
+
+
+def limit_reached(side: str, limit_price: Decimal, price: Decimal) -> bool:
+    """Whether a limit order at `limit_price` is marketable at `price`."""
+    if side == "buy":
+        return price <= limit_price
+    return price >= limit_price
+
+
+def stop_reached(side: str, stop_price: Decimal, price: Decimal) -> bool:
+    """Whether a stop at `stop_price` is triggered at `price`."""
+    if side == "buy":
+        return price >= stop_price
+    return price <= stop_price
+
+
+def limit_level(order: Order) -> Optional[Decimal]:
+    """Price a limit-style order waits for (take-profits may only carry a stop price)."""
+    return order.price if order.price is not None else order.stop_price
+
+
+@dataclass
+class _Resting:
+    """Book entry for one order."""
+    order_type: str
+    side: str
+    limit_price: Optional[Decimal]
+    stop_price: Optional[Decimal]
+    seq: int
+    stop_triggered: bool = False
+
+
+class PriceLadder:
+    """
+    Heap of trigger levels on one side of the book.
+    
+    Descending ladders fire every level at or above the price (buy limits,
+    sell stops); ascending ladders fire every level at or below it (sell
+    limits, buy stops). Entries whose ID is gone from `live`, or whose
+    sequence number no longer matches, are skipped lazily when they surface.
+    """
+    
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self._heap: List[Tuple[Decimal, int, UUID]] = []
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def push(self, level: Decimal, seq: int, order_id: UUID) -> None:
+        key = -level if self.descending else level
+        heapq.heappush(self._heap, (key, seq, order_id))
+    
+    def pop_reached(self, price: Decimal, live: Dict[UUID, Any]) -> List[UUID]:
+        """Pop every live entry whose level the price has reached."""
+        reached = []
+        while self._heap:
+            key, seq, order_id = self._heap[0]
+            entry = live.get(order_id)
+            if entry is None or entry.seq != seq:
+                heapq.heappop(self._heap)
+                continue
+            
+            level = -key if self.descending else key
+            if (level < price) if self.descending else (level > price):
+                break
+            
+            heapq.heappop(self._heap)
+            reached.append(order_id)
+        return reached
+
+
+class InstrumentBook:
+    """Resting orders for one instrument, indexed by trigger price."""
+    
+    def __init__(self):
+        self._orders: Dict[UUID, _Resting] = {}
+        # Matched orders whose fill has not been committed yet
+        self._in_flight: Dict[UUID, _Resting] = {}
+        self._seq = itertools.count()
+        self._limits = {"buy": PriceLadder(descending=True), "sell": PriceLadder(descending=False)}
+        self._stops = {"buy": PriceLadder(descending=False), "sell": PriceLadder(descending=True)}
+    
+    def __len__(self) -> int:
+        return len(self._orders)
+    
+    def __contains__(self, order_id: UUID) -> bool:
+        return order_id in self._orders
+    
+    def add(self, order: Order, stop_triggered: bool = False) -> None:
+        """
+        Rest an order in the book.
+        
+        Args:
+            order: Pending limit/stop order
+            stop_triggered: A stop-limit whose stop already fired (rests as a limit)
+        """
+        entry = _Resting(
+            order_type=order.order_type,
+            side=order.side,
+            limit_price=limit_level(order) if order.order_type != "stop" else None,
+            stop_price=order.stop_price,
+            seq=next(self._seq),
+            stop_triggered=stop_triggered,
+        )
+        self._orders[order.id] = entry
+        self._push(order.id, entry)
+    
+    def _push(self, order_id: UUID, entry: _Resting) -> None:
+        if entry.order_type in STOP_ORDER_TYPES and not entry.stop_triggered:
+            self._stops[entry.side].push(entry.stop_price, entry.seq, order_id)
+        else:
+            self._limits[entry.side].push(entry.limit_price, entry.seq, order_id)
+    
+    def remove(self, order_id: UUID) -> bool:
+        """Drop an order (its heap entries are discarded lazily)."""
+        return self._orders.pop(order_id, None) is not None
+    
+    def match(self, price: Decimal) -> List[UUID]:
+        """
+        Evaluate a price tick.
+        
+        Fired stops become market orders, except stop-limits, which re-enter
+        the book as limits and can fill on the same tick. Costs O(log n) per
+        fired order plus the heap peek.
+        
+        Returns:
+            IDs of orders to execute now (held in flight until settled or released)
+        """
+        fills = []
+        
+        for ladder in self._stops.values():
+            for order_id in ladder.pop_reached(price, self._orders):
+                entry = self._orders[order_id]
+                if entry.order_type == "stop_limit":
+                    entry.stop_triggered = True
+                    entry.seq = next(self._seq)
+                    self._push(order_id, entry)
+                else:
+                    fills.append(order_id)
+        
+        for ladder in self._limits.values():
+            fills.extend(ladder.pop_reached(price, self._orders))
+        
+        for order_id in fills:
+            self._in_flight[order_id] = self._orders.pop(order_id)
+        return fills
+    
+    def release(self, order_id: UUID) -> bool:
+        """
+        Rest a matched order again because its fill was not committed.
+        
+        Returns:
+            False if the order is not in flight or was rested again meanwhile
+        """
+        entry = self._in_flight.pop(order_id, None)
+        if entry is None or order_id in self._orders:
+            return False
+        
+        entry.seq = next(self._seq)
+        self._orders[order_id] = entry
+        self._push(order_id, entry)
+        return True
+    
+    def settle(self, order_id: UUID) -> None:
+        """Forget a matched order once its fill is committed."""
+        self._in_flight.pop(order_id, None)
+
+
+class OrderBook:
+    """Resting orders for every instrument."""
+    
+    def __init__(self):
+        self._books: Dict[UUID, InstrumentBook] = {}
+        self._instrument_by_order: Dict[UUID, UUID] = {}
+        self._in_flight: Dict[UUID, UUID] = {}
+    
+    def __len__(self) -> int:
+        return len(self._instrument_by_order)
+    
+    def instruments(self) -> List[UUID]:
+        """Instruments with at least one resting order."""
+        return [iid for iid, book in self._books.items() if len(book)]
+    
+    def add(self, order: Order, stop_triggered: bool = False) -> None:
+        """Rest a pending order."""
+        book = self._books.setdefault(order.instrument_id, InstrumentBook())
+        book.add(order, stop_triggered=stop_triggered)
+        self._instrument_by_order[order.id] = order.instrument_id
+    
+    def remove(self, order_id: UUID) -> bool:
+        """Remove a canceled or filled order."""
+        instrument_id = self._instrument_by_order.pop(order_id, None)
+        if instrument_id is None:
+            return False
+        return self._books[instrument_id].remove(order_id)
+    
+    def match(self, instrument_id: UUID, price: Decimal) -> List[UUID]:
+        """
+        Orders on an instrument that a new price fills.
+        
+        Matched orders leave the book but stay in flight: `settle` forgets
+        them once the tick's transaction commits, `release` rests them again
+        if it does not (or if another process holds their row).
+        """
+        book = self._books.get(instrument_id)
+        if book is None:
+            return []
+        
+        fills = book.match(price)
+        for order_id in fills:
+            self._instrument_by_order.pop(order_id, None)
+            self._in_flight[order_id] = instrument_id
+        return fills
+    
+    def in_flight(self, order_id: UUID) -> bool:
+        """Whether an order was matched and its fill is not settled yet."""
+        return order_id in self._in_flight
+    
+    def release(self, order_ids: Optional[Iterable[UUID]] = None) -> int:
+        """
+        Rest in-flight orders again.
+        
+        Args:
+            order_ids: Orders to release (default: every order in flight)
+            
+        Returns:
+            Number of orders back in the book
+        """
+        if order_ids is None:
+            order_ids = list(self._in_flight)
+        
+        released = 0
+        for order_id in order_ids:
+            instrument_id = self._in_flight.pop(order_id, None)
+            if instrument_id is not None and self._books[instrument_id].release(order_id):
+                self._instrument_by_order[order_id] = instrument_id
+                released += 1
+        return released
+    
+    def settle(self) -> None:
+        """Forget every in-flight order after the tick's transaction commits."""
+        for order_id, instrument_id in self._in_flight.items():
+            self._books[instrument_id].settle(order_id)
+        self._in_flight.clear()
+    
+    async def rebuild(self, session: AsyncSession) -> int:
+        """
+        Reload the book from pending orders.
+        
+        Returns:
+            Number of resting orders
+        """
+        result = await session.execute(
+            select(Order)
+            .where(Order.status == "pending")
+            .where(Order.order_type.in_(RESTING_ORDER_TYPES))
+            .order_by(Order.created_at)
+        )
+        
+        self._books.clear()
+        self._instrument_by_order.clear()
+        self._in_flight.clear()
+        for order in result.scalars().all():
+            self.add(order)
+        
+        return len(self)
+
+
+# Global order book instance
+order_book = OrderBook()
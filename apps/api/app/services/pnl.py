@@ -4,12 +4,14 @@ from decimal import Decimal
 from typing import List, Dict, Any
 from datetime import datetime
 
+from sqlalchemy import Numeric, case, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.models.position import Position
 from app.models.instrument import Instrument
-from app.models.candle import Candle
+from app.services.price_cache import price_cache
 
 
 class PnLCalculator:
@@ -72,21 +74,92 @@ class PnLCalculator:
         Returns:
             List of updated positions
         """
-        # Get all open positions
+        await self.mark_to_market(account_id)
+        
+        # Reload so the identity map reflects the bulk update
         result = await self.session.execute(
             select(Position)
             .where(Position.account_id == account_id)
             .where(Position.is_open == True)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().all()
+    
+    async def mark_to_market(self, account_id=None) -> Dict[Any, Dict[str, Any]]:
+        """
+        Re-price open positions with one set-based UPDATE.
+        
+        Latest prices for every instrument involved come from the shared price
+        cache (one query for whatever is stale), and all positions are updated
+        in a single `UPDATE ... FROM (VALUES ...)` that returns per-account
+        aggregates, so cost does not grow with round-trips per position.
+        
+        Args:
+            account_id: Limit to one account (None = every account)
+            
+        Returns:
+            Mapping of account ID to {"open_positions_count", "unrealized_pnl"}
+        """
+        open_filter = [Position.is_open == True]
+        if account_id is not None:
+            open_filter.append(Position.account_id == account_id)
+        
+        result = await self.session.execute(
+            select(Position.instrument_id).where(*open_filter).distinct()
+        )
+        prices = await price_cache.get_prices(self.session, result.scalars().all())
+        if not prices:
+            return {}
+        
+        latest = values(
+            column("instrument_id", PG_UUID(as_uuid=True)),
+            column("price", Numeric(20, 8)),
+            name="latest_prices",
+        ).data(list(prices.items()))
+        
+        pnl = case(
+            (Position.side == "long", (latest.c.price - Position.entry_price) * Position.size),
+            else_=(Position.entry_price - latest.c.price) * Position.size,
+        )
+        updated = (
+            update(Position)
+            .where(*open_filter)
+            .where(Position.instrument_id == latest.c.instrument_id)
+            .values(
+                current_price=latest.c.price,
+                unrealized_pnl=pnl,
+                updated_at=datetime.utcnow(),
+            )
+            .returning(Position.account_id, Position.unrealized_pnl)
+            .cte("updated")
+        )
+        
+        result = await self.session.execute(
+            select(
+                updated.c.account_id,
+                func.count(),
+                func.coalesce(func.sum(updated.c.unrealized_pnl), 0),
+            ).group_by(updated.c.account_id)
         )
-        positions = result.scalars().all()
         
-        # Update each position
-        updated_positions = []
-        for position in positions:
-            updated = await self.update_position_pnl(position)
-            updated_positions.append(updated)
+        return {
+            row_account_id: {
+                "open_positions_count": count,
+                "unrealized_pnl": unrealized_pnl,
+            }
+            for row_account_id, count, unrealized_pnl in result.all()
+        }
+    
+    async def load_prices(self, positions: List[Position]) -> None:
+        """
+        Refresh cached prices for the open positions' instruments in one query.
         
-        return updated_positions
+        Args:
+            positions: Positions about to be marked to market
+        """
+        await price_cache.get_prices(
+            self.session, [p.instrument_id for p in positions if p.is_open]
+        )
     
     def calculate_pnl_percentage(self, position: Position) -> float:
         """
@@ -121,72 +194,60 @@ class PnLCalculator:
         Returns:
             Dictionary with P&L metrics
         """
-        # Get all positions (open and closed)
-        result = await self.session.execute(
-            select(Position).where(Position.account_id == account_id)
-        )
-        all_positions = result.scalars().all()
-        
-        # Separate open and closed positions
-        open_positions = [p for p in all_positions if p.is_open]
-        closed_positions = [p for p in all_positions if not p.is_open]
-        
-        # Update open positions P&L
-        for position in open_positions:
-            await self.update_position_pnl(position)
+        # Mark open positions in one statement
+        await self.mark_to_market(account_id)
         
-        # Calculate totals
-        total_unrealized_pnl = sum(
-            p.unrealized_pnl for p in open_positions
+        # Count every open position; ones without a price keep their stored P&L
+        result = await self.session.execute(
+            select(func.count(), func.coalesce(func.sum(Position.unrealized_pnl), 0))
+            .where(Position.account_id == account_id)
+            .where(Position.is_open == True)
         )
+        open_positions_count, total_unrealized_pnl = result.one()
         
-        total_realized_pnl = sum(
-            p.realized_pnl for p in closed_positions
+        # Closed-position statistics in one aggregate query
+        win = Position.realized_pnl > 0
+        loss = Position.realized_pnl < 0
+        result = await self.session.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(Position.realized_pnl), 0),
+                func.count().filter(win),
+                func.count().filter(loss),
+                func.avg(Position.realized_pnl).filter(win),
+                func.avg(Position.realized_pnl).filter(loss),
+            )
+            .where(Position.account_id == account_id)
+            .where(Position.is_open == False)
         )
+        (
+            closed_positions_count,
+            total_realized_pnl,
+            winning_positions_count,
+            losing_positions_count,
+            avg_win,
+            avg_loss,
+        ) = result.one()
         
         total_pnl = total_unrealized_pnl + total_realized_pnl
         
-        # Calculate win/loss stats for closed positions
-        winning_positions = [p for p in closed_positions if p.realized_pnl > 0]
-        losing_positions = [p for p in closed_positions if p.realized_pnl < 0]
-        
         win_rate = 0.0
-        if closed_positions:
-            win_rate = (len(winning_positions) / len(closed_positions)) * 100
-        
-        avg_win = 0.0
-        if winning_positions:
-            avg_win = sum(p.realized_pnl for p in winning_positions) / len(winning_positions)
-        
-        avg_loss = 0.0
-        if losing_positions:
-            avg_loss = sum(p.realized_pnl for p in losing_positions) / len(losing_positions)
+        if closed_positions_count:
+            win_rate = (winning_positions_count / closed_positions_count) * 100
         
         return {
             "total_pnl": float(total_pnl),
             "unrealized_pnl": float(total_unrealized_pnl),
             "realized_pnl": float(total_realized_pnl),
-            "open_positions_count": len(open_positions),
-            "closed_positions_count": len(closed_positions),
-            "winning_positions": len(winning_positions),
-            "losing_positions": len(losing_positions),
+            "open_positions_count": open_positions_count,
+            "closed_positions_count": closed_positions_count,
+            "winning_positions": winning_positions_count,
+            "losing_positions": losing_positions_count,
             "win_rate": round(win_rate, 2),
-            "avg_win": float(avg_win),
-            "avg_loss": float(avg_loss),
+            "avg_win": float(avg_win or 0),
+            "avg_loss": float(avg_loss or 0),
         }
     
     async def _get_current_price(self, instrument_id) -> Decimal:
-        """Get the latest price from candle data."""
-        result = await self.session.execute(
-            select(Candle)
-            .where(Candle.instrument_id == instrument_id)
-            .where(Candle.timeframe == "1m")
-            .order_by(Candle.timestamp.desc())
-            .limit(1)
-        )
-        candle = result.scalar_one_or_none()
-        
-        if candle:
-            return candle.close
-        
-        return None
+        """Get the latest price from the shared price cache."""
+        return await price_cache.get_price(self.session, instrument_id)
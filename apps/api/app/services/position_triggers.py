@@ -0,0 +1,241 @@
+"""In-memory stop-loss / take-profit index for open positions."""
+
+import itertools
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.position import Position
+from app.services.order_book import PriceLadder
+
+
+def crossed_trigger(
+    side: str, stop_loss: Optional[Decimal], take_profit: Optional[Decimal], price: Decimal
+) -> Optional[str]:
+    """
+    Which of a position's levels a price crosses.
+    
+    Returns:
+        "stop_loss", "take_profit" or None; the stop loss wins if both are crossed
+    """
+    if stop_loss is not None and (price <= stop_loss if side == "long" else price >= stop_loss):
+        return "stop_loss"
+    if take_profit is not None and (price >= take_profit if side == "long" else price <= take_profit):
+        return "take_profit"
+    return None
+
+
+@dataclass
+class _Watched:
+    """Index entry for one position."""
+    side: str
+    stop_loss: Optional[Decimal]
+    take_profit: Optional[Decimal]
+    seq: int
+
+
+class InstrumentTriggers:
+    """SL/TP levels of the open positions on one instrument."""
+    
+    def __init__(self):
+        self._positions: Dict[UUID, _Watched] = {}
+        # Matched positions whose close has not been committed yet
+        self._in_flight: Dict[UUID, _Watched] = {}
+        self._seq = itertools.count()
+        # Longs stop out on a fall and take profit on a rise; shorts the reverse
+        self._stop_loss = {"long": PriceLadder(descending=True), "short": PriceLadder(descending=False)}
+        self._take_profit = {"long": PriceLadder(descending=False), "short": PriceLadder(descending=True)}
+    
+    def __len__(self) -> int:
+        return len(self._positions)
+    
+    def __contains__(self, position_id: UUID) -> bool:
+        return position_id in self._positions
+    
+    def add(self, position_id: UUID, side: str, stop_loss: Optional[Decimal], take_profit: Optional[Decimal]) -> None:
+        """Watch (or re-watch after an SL/TP edit) a position."""
+        if stop_loss is None and take_profit is None:
+            self._positions.pop(position_id, None)
+            return
+        
+        entry = _Watched(side, stop_loss, take_profit, next(self._seq))
+        self._positions[position_id] = entry
+        if stop_loss is not None:
+            self._stop_loss[side].push(stop_loss, entry.seq, position_id)
+        if take_profit is not None:
+            self._take_profit[side].push(take_profit, entry.seq, position_id)
+    
+    def remove(self, position_id: UUID) -> bool:
+        """Stop watching a position (its ladder entries are discarded lazily)."""
+        return self._positions.pop(position_id, None) is not None
+    
+    def match(self, price: Decimal) -> List[Tuple[UUID, str]]:
+        """
+        Positions whose stop loss or take profit the price crosses.
+        
+        Returns:
+            (position ID, "stop_loss" | "take_profit"), held in flight until
+            settled or released
+        """
+        triggered = []
+        for reason, ladders in (("stop_loss", self._stop_loss), ("take_profit", self._take_profit)):
+            for ladder in ladders.values():
+                for position_id in ladder.pop_reached(price, self._positions):
+                    # A price can cross both levels only if they are inverted;
+                    # the stop loss wins
+                    entry = self._positions.pop(position_id, None)
+                    if entry is not None:
+                        self._in_flight[position_id] = entry
+                        triggered.append((position_id, reason))
+        return triggered
+    
+    def release(self, position_id: UUID) -> bool:
+        """
+        Watch a matched position again because its close was not committed.
+        
+        Returns:
+            False if the position is not in flight or was re-watched meanwhile
+        """
+        entry = self._in_flight.pop(position_id, None)
+        if entry is None or position_id in self._positions:
+            return False
+        
+        self.add(position_id, entry.side, entry.stop_loss, entry.take_profit)
+        return True
+    
+    def settle(self, position_id: UUID) -> None:
+        """Forget a matched position once its close is committed."""
+        self._in_flight.pop(position_id, None)
+
+
+class PositionTriggerIndex:
+    """
+    SL/TP trigger index for every instrument.
+    
+    Each tick costs O(log n) per triggered position, so hundreds of
+    thousands of watched positions never require polling the database.
+    """
+    
+    def __init__(self):
+        self._instruments: Dict[UUID, InstrumentTriggers] = {}
+        self._instrument_by_position: Dict[UUID, UUID] = {}
+        self._in_flight: Dict[UUID, UUID] = {}
+    
+    def __len__(self) -> int:
+        return len(self._instrument_by_position)
+    
+    def instruments(self) -> List[UUID]:
+        """Instruments with at least one watched position."""
+        return [iid for iid, triggers in self._instruments.items() if len(triggers)]
+    
+    def add(self, position: Position) -> None:
+        """Watch an open position's current SL/TP levels."""
+        if not position.is_open:
+            self.remove(position.id)
+            return
+        
+        self._watch(position.id, position.instrument_id, position.side, position.stop_loss, position.take_profit)
+    
+    def _watch(self, position_id, instrument_id, side, stop_loss, take_profit) -> None:
+        triggers = self._instruments.setdefault(instrument_id, InstrumentTriggers())
+        triggers.add(position_id, side, stop_loss, take_profit)
+        
+        if position_id in triggers:
+            self._instrument_by_position[position_id] = instrument_id
+        else:
+            self._instrument_by_position.pop(position_id, None)
+    
+    def remove(self, position_id: UUID) -> bool:
+        """Stop watching a closed position."""
+        instrument_id = self._instrument_by_position.pop(position_id, None)
+        if instrument_id is None:
+            return False
+        return self._instruments[instrument_id].remove(position_id)
+    
+    def match(self, instrument_id: UUID, price: Decimal) -> List[Tuple[UUID, str]]:
+        """
+        Positions on an instrument whose SL/TP a new price crosses.
+        
+        Matched positions stay in flight like matched orders in the order
+        book: `settle` forgets them after the tick commits, `release`
+        watches them again if it does not.
+        """
+        triggers = self._instruments.get(instrument_id)
+        if triggers is None:
+            return []
+        
+        triggered = triggers.match(price)
+        for position_id, _ in triggered:
+            self._instrument_by_position.pop(position_id, None)
+            self._in_flight[position_id] = instrument_id
+        return triggered
+    
+    def in_flight(self, position_id: UUID) -> bool:
+        """Whether a position's trigger matched and its close is not settled yet."""
+        return position_id in self._in_flight
+    
+    def release(self, position_ids: Optional[Iterable[UUID]] = None) -> int:
+        """
+        Watch in-flight positions again.
+        
+        Args:
+            position_ids: Positions to release (default: every position in flight)
+            
+        Returns:
+            Number of positions watched again
+        """
+        if position_ids is None:
+            position_ids = list(self._in_flight)
+        
+        released = 0
+        for position_id in position_ids:
+            instrument_id = self._in_flight.pop(position_id, None)
+            if instrument_id is None:
+                continue
+            triggers = self._instruments[instrument_id]
+            if triggers.release(position_id) and position_id in triggers:
+                self._instrument_by_position[position_id] = instrument_id
+                released += 1
+        return released
+    
+    def settle(self) -> None:
+        """Forget every in-flight position after the tick's transaction commits."""
+        for position_id, instrument_id in self._in_flight.items():
+            self._instruments[instrument_id].settle(position_id)
+        self._in_flight.clear()
+    
+    async def rebuild(self, session: AsyncSession) -> int:
+        """
+        Reload the index from open positions with an SL or TP.
+        
+        Returns:
+            Number of watched positions
+        """
+        result = await session.execute(
+            select(
+                Position.id,
+                Position.instrument_id,
+                Position.side,
+                Position.stop_loss,
+                Position.take_profit,
+            )
+            .where(Position.is_open == True)
+            .where(or_(Position.stop_loss != None, Position.take_profit != None))
+        )
+        
+        self._instruments.clear()
+        self._instrument_by_position.clear()
+        self._in_flight.clear()
+        for row in result.all():
+            self._watch(*row)
+        
+        return len(self)
+
+
+# Global position trigger index instance
+position_triggers = PositionTriggerIndex()
@@ -0,0 +1,110 @@
+"""In-process cache of the latest price per instrument."""
+
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models.candle import Candle
+from app.models.instrument import Instrument
+
+
+class PriceCache:
+    """
+    Latest 1m close per instrument, shared by execution and P&L.
+    
+    Prices are refreshed from the candles table once they are older than the
+    TTL, and can be pushed directly with `set_price` when candles are ingested.
+    Stale instruments are refreshed together in one query.
+    """
+    
+    def __init__(self, ttl_seconds: float = settings.PRICE_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._prices: Dict[UUID, Tuple[Decimal, float]] = {}
+    
+    def set_price(self, instrument_id: UUID, price: Decimal) -> None:
+        """Store a fresh price (e.g. from a newly ingested candle)."""
+        self._prices[instrument_id] = (price, time.monotonic())
+    
+    def invalidate(self, instrument_id: Optional[UUID] = None) -> None:
+        """Drop one cached price, or all of them."""
+        if instrument_id is None:
+            self._prices.clear()
+        else:
+            self._prices.pop(instrument_id, None)
+    
+    async def get_price(self, session: AsyncSession, instrument_id: UUID) -> Optional[Decimal]:
+        """
+        Get the latest price for an instrument.
+        
+        Args:
+            session: Database session used on a cache miss
+            instrument_id: Instrument ID
+            
+        Returns:
+            Latest close, or None if the instrument has no candles
+        """
+        prices = await self.get_prices(session, [instrument_id])
+        return prices.get(instrument_id)
+    
+    async def get_prices(
+        self, session: AsyncSession, instrument_ids: Iterable[UUID]
+    ) -> Dict[UUID, Decimal]:
+        """
+        Get latest prices for several instruments.
+        
+        Args:
+            session: Database session used for stale entries
+            instrument_ids: Instrument IDs
+            
+        Returns:
+            Mapping of instrument ID to latest close (instruments without
+            candles are omitted)
+        """
+        now = time.monotonic()
+        prices = {}
+        stale = set()
+        
+        for instrument_id in set(instrument_ids):
+            cached = self._prices.get(instrument_id)
+            if cached and now - cached[1] < self.ttl_seconds:
+                prices[instrument_id] = cached[0]
+            else:
+                stale.add(instrument_id)
+        
+        if stale:
+            fetched = await self._fetch_latest(session, stale)
+            for instrument_id, price in fetched.items():
+                self.set_price(instrument_id, price)
+            prices.update(fetched)
+        
+        return prices
+    
+    async def _fetch_latest(
+        self, session: AsyncSession, instrument_ids: Iterable[UUID]
+    ) -> Dict[UUID, Decimal]:
+        """Latest 1m close for each instrument (one index seek per instrument)."""
+        latest = (
+            select(Candle.close)
+            .where(Candle.instrument_id == Instrument.id)
+            .where(Candle.timeframe == "1m")
+            .order_by(Candle.timestamp.desc())
+            .limit(1)
+            .lateral()
+        )
+        result = await session.execute(
+            select(Instrument.id, latest.c.close)
+            .select_from(Instrument)
+            .join(latest, true())
+            .where(Instrument.id.in_(list(instrument_ids)))
+        )
+        return {instrument_id: close for instrument_id, close in result.all()}
+
+
+# Global price cache instance
+price_cache = PriceCache()
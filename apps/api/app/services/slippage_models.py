@@ -0,0 +1,48 @@
+"""Per-account slippage models for live fills."""
+
+from collections import OrderedDict
+from uuid import UUID
+
+from simulation import SlippageModel
+
+from app.core.config import settings
+
+
+class SlippageModelCache:
+    """
+    One seeded `SlippageModel` per account, least recently used evicted first.
+    
+    Each account draws from its own stream, seeded from the account and the
+    order that starts the stream. A restarted process or an evicted account
+    therefore starts a fresh stream instead of replaying earlier draws.
+    """
+    
+    def __init__(self, max_accounts: int = settings.SLIPPAGE_MODEL_CACHE_SIZE):
+        self.max_accounts = max_accounts
+        self._models: "OrderedDict[UUID, SlippageModel]" = OrderedDict()
+    
+    def get(self, account_id: UUID, order_id: UUID) -> SlippageModel:
+        """
+        The account's model, created on first use.
+        
+        Args:
+            account_id: Account being filled
+            order_id: Order being filled (seeds a new stream)
+            
+        Returns:
+            The account's slippage model
+        """
+        model = self._models.get(account_id)
+        if model is not None:
+            self._models.move_to_end(account_id)
+            return model
+        
+        model = SlippageModel(seed=account_id.int ^ order_id.int)
+        self._models[account_id] = model
+        if len(self._models) > self.max_accounts:
+            self._models.popitem(last=False)
+        return model
+
+
+# Global slippage model cache instance
+slippage_models = SlippageModelCache()
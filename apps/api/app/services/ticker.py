@@ -0,0 +1,99 @@
+"""Background price ticker that drives order and SL/TP triggers."""
+
+import asyncio
+from decimal import Decimal
+from typing import Dict, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.services.execution import ExecutionService
+from app.services.order_book import order_book
+from app.services.position_triggers import position_triggers
+from app.services.price_cache import price_cache
+
+
+class MarketTicker:
+    """
+    Polls latest prices for instruments with resting orders or watched
+    positions and feeds every changed price to the order book
+    (`process_price_tick`) and the SL/TP index (`process_position_triggers`).
+    """
+    
+    def __init__(self, interval_seconds: float = settings.ORDER_TRIGGER_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._last_prices: Dict[UUID, Decimal] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Rebuild the order book and SL/TP index, then start ticking."""
+        async with async_session() as session:
+            resting = await order_book.rebuild(session)
+            watched = await position_triggers.rebuild(session)
+        print(f"Order book rebuilt with {resting} resting orders, {watched} SL/TP positions")
+        
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop ticking."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"Warning: Market tick failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+    
+    async def tick(self) -> int:
+        """
+        Evaluate one round of prices.
+        
+        Returns:
+            Number of orders filled and positions closed
+        """
+        instrument_ids = set(order_book.instruments()) | set(position_triggers.instruments())
+        if not instrument_ids:
+            return 0
+        
+        filled = 0
+        async with async_session() as session:
+            try:
+                prices = await price_cache.get_prices(session, instrument_ids)
+                execution_service = ExecutionService(session)
+                
+                for instrument_id, price in prices.items():
+                    if self._last_prices.get(instrument_id) == price:
+                        continue
+                    self._last_prices[instrument_id] = price
+                    
+                    results = await execution_service.process_price_tick(instrument_id, price)
+                    filled += sum(1 for r in results if r["success"])
+                    
+                    closed = await execution_service.process_position_triggers(instrument_id, price)
+                    filled += len(closed)
+                
+                await session.commit()
+            except Exception:
+                # Nothing from this tick was committed: put the matched orders
+                # and positions back and re-evaluate every price next tick
+                order_book.release()
+                position_triggers.release()
+                self._last_prices.clear()
+                raise
+        
+        order_book.settle()
+        position_triggers.settle()
+        
+        return filled
+
+
+# Global market ticker instance
+market_ticker = MarketTicker()
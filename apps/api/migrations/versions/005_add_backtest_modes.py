@@ -0,0 +1,34 @@
+"""Add backtest run modes and parameter sweep grid
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add mode and param_grid columns to backtests."""
+    op.add_column(
+        'backtests',
+        sa.Column('mode', sa.String(50), nullable=False, server_default='single'),
+    )
+    op.add_column(
+        'backtests',
+        sa.Column('param_grid', postgresql.JSON, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop backtest mode columns."""
+    op.drop_column('backtests', 'param_grid')
+    op.drop_column('backtests', 'mode')
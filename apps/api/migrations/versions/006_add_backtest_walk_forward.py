@@ -0,0 +1,29 @@
+"""Add walk-forward configuration to backtests
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add walk_forward column to backtests."""
+    op.add_column(
+        'backtests',
+        sa.Column('walk_forward', postgresql.JSON, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop walk_forward column from backtests."""
+    op.drop_column('backtests', 'walk_forward')
@@ -0,0 +1,29 @@
+"""Add Monte Carlo risk report to backtests
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add monte_carlo column to backtests."""
+    op.add_column(
+        'backtests',
+        sa.Column('monte_carlo', postgresql.JSON, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop monte_carlo column from backtests."""
+    op.drop_column('backtests', 'monte_carlo')
@@ -0,0 +1,68 @@
+"""Add candle rollup watermarks
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create candle_rollup_watermarks and make candle keys unique."""
+    
+    op.create_table(
+        'candle_rollup_watermarks',
+        sa.Column('instrument_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('instruments.id'), nullable=False),
+        sa.Column('timeframe', sa.String(10), nullable=False),
+        sa.Column('watermark', sa.DateTime, nullable=False),
+        sa.Column('updated_at', sa.DateTime, nullable=False),
+        sa.PrimaryKeyConstraint('instrument_id', 'timeframe'),
+    )
+    
+    # Rollups upsert on (instrument, timeframe, timestamp); keep only the
+    # most recently written candle of any duplicated key first
+    op.execute(
+        """
+        DELETE FROM candles
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    row_number() OVER (
+                        PARTITION BY instrument_id, timeframe, timestamp
+                        ORDER BY created_at DESC, id DESC
+                    ) AS duplicate_rank
+                FROM candles
+            ) AS ranked
+            WHERE duplicate_rank > 1
+        )
+        """
+    )
+    op.drop_index('ix_candles_instrument_timeframe_timestamp', 'candles')
+    op.create_index(
+        'ix_candles_instrument_timeframe_timestamp',
+        'candles',
+        ['instrument_id', 'timeframe', 'timestamp'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop candle_rollup_watermarks and restore the non-unique candle index."""
+    
+    op.drop_index('ix_candles_instrument_timeframe_timestamp', 'candles')
+    op.create_index(
+        'ix_candles_instrument_timeframe_timestamp',
+        'candles',
+        ['instrument_id', 'timeframe', 'timestamp'],
+    )
+    op.drop_table('candle_rollup_watermarks')
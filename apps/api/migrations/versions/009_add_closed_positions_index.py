@@ -0,0 +1,34 @@
+"""Add covering index for closed position statistics
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index closed positions per account with realized P&L included."""
+    
+    # Lets account P&L statistics aggregate from an index-only scan
+    op.create_index(
+        'idx_positions_account_closed_pnl',
+        'positions',
+        ['account_id'],
+        postgresql_include=['realized_pnl'],
+        postgresql_where=sa.text('NOT is_open'),
+    )
+
+
+def downgrade() -> None:
+    """Drop closed positions index."""
+    
+    op.drop_index('idx_positions_account_closed_pnl', 'positions')
@@ -0,0 +1,28 @@
+"""Add position netting mode to accounts
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add position_mode column to accounts."""
+    op.add_column(
+        'accounts',
+        sa.Column('position_mode', sa.String(20), nullable=False, server_default='hedging'),
+    )
+
+
+def downgrade() -> None:
+    """Drop position_mode column from accounts."""
+    op.drop_column('accounts', 'position_mode')
@@ -0,0 +1,28 @@
+"""Add execution mode to accounts
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add execution_mode column to accounts."""
+    op.add_column(
+        'accounts',
+        sa.Column('execution_mode', sa.String(20), nullable=False, server_default='direct'),
+    )
+
+
+def downgrade() -> None:
+    """Drop execution_mode column from accounts."""
+    op.drop_column('accounts', 'execution_mode')
@@ -0,0 +1,36 @@
+"""Add client order IDs to orders
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add client_order_id column with a per-account unique index."""
+    op.add_column(
+        'orders',
+        sa.Column('client_order_id', sa.String(64), nullable=True),
+    )
+    op.create_index(
+        'uq_orders_account_client_order_id',
+        'orders',
+        ['account_id', 'client_order_id'],
+        unique=True,
+        postgresql_where=sa.text('client_order_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Drop client_order_id column and its index."""
+    op.drop_index('uq_orders_account_client_order_id', 'orders')
+    op.drop_column('orders', 'client_order_id')
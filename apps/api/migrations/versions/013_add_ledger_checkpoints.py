@@ -0,0 +1,46 @@
+"""Add ledger checkpoints
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create ledger_checkpoints and index entries in checkpoint order."""
+    
+    op.create_table(
+        'ledger_checkpoints',
+        sa.Column('account_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('accounts.id'), nullable=False),
+        sa.Column('last_entry_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('last_entry_at', sa.DateTime, nullable=False),
+        sa.Column('entries_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('ledger_sum', sa.Numeric(20, 2), nullable=False, server_default='0'),
+        sa.Column('balance_after', sa.Numeric(20, 2), nullable=False),
+        sa.Column('created_at', sa.DateTime, nullable=False),
+        sa.PrimaryKeyConstraint('account_id'),
+    )
+    
+    # Entries after a checkpoint are read as a (created_at, id) range per account
+    op.create_index(
+        'ix_ledger_entries_account_created_id',
+        'ledger_entries',
+        ['account_id', 'created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Drop ledger_checkpoints and its supporting index."""
+    
+    op.drop_index('ix_ledger_entries_account_created_id', 'ledger_entries')
+    op.drop_table('ledger_checkpoints')
@@ -0,0 +1,129 @@
+"""Partition ledger_entries and candles by month
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+# Table -> partition key. Partitions are named <table>_pYYYY_MM; the worker's
+# ensure_partitions task keeps creating them ahead of time.
+PARTITIONED_TABLES = {
+    'ledger_entries': 'created_at',
+    'candles': 'timestamp',
+}
+FUTURE_MONTHS = 3
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    years, month = divmod(value.month - 1 + months, 12)
+    return value.replace(year=value.year + years, month=month + 1)
+
+
+def _partition_table(table: str, column: str) -> None:
+    """Move a table's rows into a new monthly range-partitioned table."""
+    
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS) "
+        f"PARTITION BY RANGE ({column})"
+    )
+    
+    # One partition per month from the oldest row to a few months ahead
+    oldest = op.get_bind().execute(
+        sa.text(f"SELECT min({column}) FROM {table}_unpartitioned")
+    ).scalar()
+    now = datetime.utcnow()
+    month = _month_start(oldest or now)
+    last = _add_months(_month_start(now), FUTURE_MONTHS)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+        )
+        month = upper
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_unpartitioned")
+    op.execute(f"DROP TABLE {table}_unpartitioned")
+
+
+def _unpartition_table(table: str) -> None:
+    """Copy a partitioned table back into a plain table."""
+    
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+    op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+    op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+
+
+def upgrade() -> None:
+    """Range-partition ledger_entries and candles by month."""
+    
+    for table, column in PARTITIONED_TABLES.items():
+        _partition_table(table, column)
+    
+    # Primary keys on partitioned tables must include the partition key
+    op.create_primary_key('ledger_entries_pkey', 'ledger_entries', ['id', 'created_at'])
+    op.create_foreign_key('ledger_entries_account_id_fkey', 'ledger_entries', 'accounts', ['account_id'], ['id'])
+    op.create_foreign_key('ledger_entries_order_id_fkey', 'ledger_entries', 'orders', ['order_id'], ['id'])
+    op.create_foreign_key('ledger_entries_position_id_fkey', 'ledger_entries', 'positions', ['position_id'], ['id'])
+    # The (account_id, created_at, id) index also serves account_id lookups
+    op.create_index('ix_ledger_entries_account_created_id', 'ledger_entries', ['account_id', 'created_at', 'id'])
+    op.create_index('ix_ledger_entries_entry_type', 'ledger_entries', ['entry_type'])
+    op.create_index('ix_ledger_entries_created_at', 'ledger_entries', ['created_at'])
+    
+    op.create_primary_key('candles_pkey', 'candles', ['id', 'timestamp'])
+    op.create_foreign_key('candles_instrument_id_fkey', 'candles', 'instruments', ['instrument_id'], ['id'])
+    # Instrument, timeframe and time-range lookups all go through this index;
+    # partition pruning replaces the single-column timestamp index
+    op.create_index(
+        'ix_candles_instrument_timeframe_timestamp',
+        'candles',
+        ['instrument_id', 'timeframe', 'timestamp'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Restore unpartitioned ledger_entries and candles."""
+    
+    for table in PARTITIONED_TABLES:
+        _unpartition_table(table)
+    
+    op.create_primary_key('ledger_entries_pkey', 'ledger_entries', ['id'])
+    op.create_foreign_key('ledger_entries_account_id_fkey', 'ledger_entries', 'accounts', ['account_id'], ['id'])
+    op.create_foreign_key('ledger_entries_order_id_fkey', 'ledger_entries', 'orders', ['order_id'], ['id'])
+    op.create_foreign_key('ledger_entries_position_id_fkey', 'ledger_entries', 'positions', ['position_id'], ['id'])
+    op.create_index('ix_ledger_entries_account_id', 'ledger_entries', ['account_id'])
+    op.create_index('ix_ledger_entries_entry_type', 'ledger_entries', ['entry_type'])
+    op.create_index('ix_ledger_entries_created_at', 'ledger_entries', ['created_at'])
+    op.create_index('ix_ledger_entries_account_created_id', 'ledger_entries', ['account_id', 'created_at', 'id'])
+    
+    op.create_primary_key('candles_pkey', 'candles', ['id'])
+    op.create_foreign_key('candles_instrument_id_fkey', 'candles', 'instruments', ['instrument_id'], ['id'])
+    op.create_index('ix_candles_instrument_id', 'candles', ['instrument_id'])
+    op.create_index('ix_candles_timeframe', 'candles', ['timeframe'])
+    op.create_index('ix_candles_timestamp', 'candles', ['timestamp'])
+    op.create_index(
+        'ix_candles_instrument_timeframe_timestamp',
+        'candles',
+        ['instrument_id', 'timeframe', 'timestamp'],
+        unique=True,
+    )
@@ -0,0 +1,45 @@
+"""Add candles archive
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create candles_archive for cold 1m candles moved out of candles."""
+    
+    # Same columns as candles, partitioned by month like it; the worker's
+    # archive_candles task creates a partition per archived month, which can
+    # later be detached and dumped on its own
+    op.execute(
+        "CREATE TABLE candles_archive (LIKE candles INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (timestamp)"
+    )
+    op.create_primary_key('candles_archive_pkey', 'candles_archive', ['id', 'timestamp'])
+    op.create_index(
+        'ix_candles_archive_instrument_timeframe_timestamp',
+        'candles_archive',
+        ['instrument_id', 'timeframe', 'timestamp'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Move archived candles back into candles and drop candles_archive."""
+    
+    columns = (
+        "id, instrument_id, timeframe, timestamp, "
+        "open, high, low, close, volume, created_at"
+    )
+    op.execute(f"INSERT INTO candles ({columns}) SELECT {columns} FROM candles_archive")
+    op.execute("DROP TABLE candles_archive CASCADE")
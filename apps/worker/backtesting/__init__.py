@@ -0,0 +1,29 @@
+"""Vectorized backtesting engine used by the worker."""
+
+from .data import CandleArrays, load_candles
+from .candle_store import CandleStore, candle_store
+from .engine import run_vectorized_backtest, slippage_model_from_params
+from .metrics import compute_metrics
+from .signals import signals_to_positions, strategy_positions
+from .parallel import candle_pool
+from .sweep import expand_param_grid, run_parameter_sweep
+from .walk_forward import build_windows, run_walk_forward
+from .monte_carlo import run_monte_carlo
+
+__all__ = [
+    "CandleArrays",
+    "load_candles",
+    "CandleStore",
+    "candle_store",
+    "run_vectorized_backtest",
+    "slippage_model_from_params",
+    "compute_metrics",
+    "signals_to_positions",
+    "strategy_positions",
+    "candle_pool",
+    "expand_param_grid",
+    "run_parameter_sweep",
+    "build_windows",
+    "run_walk_forward",
+    "run_monte_carlo",
+]
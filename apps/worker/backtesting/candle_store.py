@@ -0,0 +1,327 @@
+"""Local columnar candle store backed by memory-mapped files."""
+
+import fcntl
+import os
+import struct
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+import numpy as np
+from sqlalchemy import text
+
+from database import engine
+
+from .data import CandleArrays
+
+
+# Root directory of the store (one file per instrument/timeframe)
+CANDLE_STORE_PATH = os.getenv("CANDLE_STORE_PATH", os.path.join(".cache", "candles"))
+
+# File layout: 64-byte header, then a (6, capacity) block of 8-byte values.
+# Row 0 holds int64 epoch seconds, rows 1-5 float64 open/high/low/close/volume.
+MAGIC = b"TCNDL001"
+HEADER_FORMAT = "<8sqq"  # magic, count, capacity
+HEADER_SIZE = 64
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+INITIAL_CAPACITY = 4096
+
+EPOCH = datetime(1970, 1, 1)
+
+# Rows fetched per round trip when syncing from Postgres
+SYNC_BATCH_SIZE = 50000
+
+CANDLE_SYNC_QUERY = text(
+    """
+    SELECT
+        CAST(EXTRACT(EPOCH FROM timestamp) AS BIGINT),
+        CAST(open AS DOUBLE PRECISION),
+        CAST(high AS DOUBLE PRECISION),
+        CAST(low AS DOUBLE PRECISION),
+        CAST(close AS DOUBLE PRECISION),
+        CAST(volume AS DOUBLE PRECISION)
+    FROM (
+        SELECT instrument_id, timeframe, timestamp, open, high, low, close, volume
+        FROM candles
+        UNION ALL
+        -- 1m candles moved out of cold partitions (see tasks.partitions)
+        SELECT instrument_id, timeframe, timestamp, open, high, low, close, volume
+        FROM candles_archive
+    ) AS candles
+    WHERE instrument_id = :instrument_id
+      AND timeframe = :timeframe
+      AND timestamp >= :since
+    ORDER BY timestamp
+    """
+)
+
+
+class CandleStore:
+    """
+    Columnar candle cache with one memory-mapped file per (instrument, timeframe).
+    
+    Files are filled incrementally from the `candles` table and read through
+    `np.memmap`, so ranges come back as zero-copy views instead of SQLModel
+    rows with six Decimals each.
+    """
+
+    def __init__(self, root: str = CANDLE_STORE_PATH):
+        self.root = root
+
+    def path(self, instrument_id: str, timeframe: str) -> str:
+        """File path for an instrument/timeframe."""
+        return os.path.join(self.root, str(instrument_id), f"{timeframe}.candles")
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _read_header(self, path: str):
+        with open(path, "rb") as f:
+            return self._parse_header(f, path)
+
+    def _parse_header(self, f, path: str):
+        f.seek(0)
+        magic, count, capacity = struct.unpack(
+            HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT))
+        )
+        if magic != MAGIC:
+            raise ValueError(f"Not a candle store file: {path}")
+        return count, capacity
+
+    def _map(self, source, capacity: int, mode: str = "r") -> np.memmap:
+        """Map a file by path or open file object."""
+        return np.memmap(
+            source,
+            dtype=np.float64,
+            mode=mode,
+            offset=HEADER_SIZE,
+            shape=(len(COLUMNS), capacity),
+        )
+
+    def open(self, instrument_id: str, timeframe: str) -> Optional[CandleArrays]:
+        """
+        Map every stored candle for an instrument/timeframe.
+        
+        Returns:
+            CandleArrays of read-only memmap views, or None if nothing is stored
+        """
+        path = self.path(instrument_id, timeframe)
+        if not os.path.exists(path):
+            return None
+        
+        # Header and mapping must come from the same file: a concurrent grow
+        # atomically replaces the path with a larger one
+        with open(path, "rb") as f:
+            count, capacity = self._parse_header(f, path)
+            if count == 0:
+                return None
+            block = self._map(f, capacity)[:, :count]
+        
+        return CandleArrays(
+            timestamp=block[0].view(np.int64),
+            open=block[1],
+            high=block[2],
+            low=block[3],
+            close=block[4],
+            volume=block[5],
+        )
+
+    def read(
+        self, instrument_id: str, timeframe: str, start: datetime, end: datetime
+    ) -> Optional[CandleArrays]:
+        """
+        Zero-copy views of the candles in [start, end].
+        
+        Returns:
+            CandleArrays, or None if no stored candle falls in the range
+        """
+        candles = self.open(instrument_id, timeframe)
+        if candles is None:
+            return None
+        
+        lo, hi = np.searchsorted(
+            candles.timestamp,
+            [_epoch(start), _epoch(end)],
+        )
+        # `end` is inclusive
+        if hi < len(candles) and candles.timestamp[hi] == _epoch(end):
+            hi += 1
+        
+        if hi <= lo:
+            return None
+        return candles.slice(int(lo), int(hi))
+
+    def tail(self, instrument_id: str, timeframe: str, count: int) -> Optional[CandleArrays]:
+        """Zero-copy views of the latest `count` candles (e.g. for bot warm-up)."""
+        candles = self.open(instrument_id, timeframe)
+        if candles is None:
+            return None
+        return candles.slice(max(len(candles) - count, 0), len(candles))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _lock(self, path: str) -> Iterator[None]:
+        """Exclusive writer lock per file (readers never block)."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _create(self, path: str, capacity: int, source: Optional[np.ndarray] = None) -> None:
+        """Write a new file (atomically replacing any existing one)."""
+        tmp_path = path + ".tmp"
+        count = source.shape[1] if source is not None else 0
+        
+        with open(tmp_path, "wb") as f:
+            f.write(struct.pack(HEADER_FORMAT, MAGIC, count, capacity).ljust(HEADER_SIZE, b"\0"))
+            f.truncate(HEADER_SIZE + len(COLUMNS) * capacity * 8)
+        
+        if count:
+            block = self._map(tmp_path, capacity, mode="r+")
+            block[:, :count] = source
+            block.flush()
+            del block
+        
+        os.replace(tmp_path, path)
+
+    def _set_count(self, path: str, count: int, capacity: int) -> None:
+        with open(path, "r+b") as f:
+            f.write(struct.pack(HEADER_FORMAT, MAGIC, count, capacity))
+
+    def write(self, instrument_id: str, timeframe: str, rows: np.ndarray) -> int:
+        """
+        Merge candles into the store.
+        
+        Rows must be sorted by timestamp. Rows at or after the last stored
+        timestamp overwrite/extend the tail, so the still-forming latest candle
+        can be refreshed in place.
+        
+        Args:
+            instrument_id: Instrument UUID
+            timeframe: Candle timeframe
+            rows: float64 array of shape (n, 6) in COLUMNS order
+            
+        Returns:
+            Number of stored candles after the write
+        """
+        path = self.path(instrument_id, timeframe)
+        
+        with self._lock(path):
+            if not os.path.exists(path):
+                self._create(path, INITIAL_CAPACITY)
+            
+            count, capacity = self._read_header(path)
+            return self._append(path, count, capacity, rows)
+
+    def _append(self, path: str, count: int, capacity: int, rows: np.ndarray) -> int:
+        if len(rows) == 0:
+            return count
+        
+        block = self._map(path, capacity)
+        timestamps = block[0, :count].view(np.int64)
+        
+        # First incoming row replaces any stored row with the same or later timestamp
+        start = int(np.searchsorted(timestamps, int(rows[0, 0])))
+        new_count = start + len(rows)
+        
+        if new_count > capacity:
+            # Grow geometrically into a new file; readers keep their old mapping
+            new_capacity = max(capacity * 2, new_count)
+            merged = np.empty((len(COLUMNS), new_count))
+            merged[:, :start] = block[:, :start]
+            merged[:, start:] = _pack(rows)
+            del block
+            self._create(path, new_capacity, merged)
+            return new_count
+        
+        del block
+        block = self._map(path, capacity, mode="r+")
+        block[:, start:new_count] = _pack(rows)
+        block.flush()
+        del block
+        
+        # Publish the new length only after the data is written
+        self._set_count(path, new_count, capacity)
+        return new_count
+
+    def sync(
+        self, instrument_id: str, timeframe: str, connection=None, since: Optional[datetime] = None
+    ) -> int:
+        """
+        Incrementally fill the store from the `candles` table.
+        
+        Only rows from the last stored timestamp onward are fetched (the last
+        one is refreshed in case it was still forming), so candles backfilled
+        or corrected further back are not picked up on their own. Pass `since`
+        after such a change: everything stored from that point on is fetched
+        again and replaced.
+        
+        Args:
+            instrument_id: Instrument UUID
+            timeframe: Candle timeframe
+            connection: Optional open SQLAlchemy connection to reuse
+            since: Re-fetch from this time (UTC) instead of the last stored candle
+            
+        Returns:
+            Number of stored candles after syncing
+        """
+        path = self.path(instrument_id, timeframe)
+        
+        with self._lock(path):
+            if not os.path.exists(path):
+                self._create(path, INITIAL_CAPACITY)
+            
+            count, capacity = self._read_header(path)
+            start = 0
+            if count:
+                start = int(self._map(path, capacity)[0, count - 1:count].view(np.int64)[0])
+            if since is not None and count:
+                start = min(start, _epoch(since))
+            
+            params = {
+                "instrument_id": str(instrument_id),
+                "timeframe": timeframe,
+                "since": EPOCH + timedelta(seconds=start),
+            }
+            
+            if connection is not None:
+                return self._sync_rows(path, connection, params, count, capacity)
+            with engine.connect() as conn:
+                return self._sync_rows(path, conn, params, count, capacity)
+
+    def _sync_rows(self, path: str, connection, params: dict, count: int, capacity: int) -> int:
+        result = connection.execution_options(stream_results=True).execute(
+            CANDLE_SYNC_QUERY, params
+        )
+        while True:
+            batch = result.fetchmany(SYNC_BATCH_SIZE)
+            if not batch:
+                break
+            count = self._append(path, count, capacity, np.array(batch, dtype=np.float64))
+            _, capacity = self._read_header(path)
+        return count
+
+
+def _epoch(value: datetime) -> int:
+    """Naive-UTC datetime to epoch seconds."""
+    if value.tzinfo is not None:
+        return int(value.timestamp())
+    return int((value - EPOCH).total_seconds())
+
+
+def _pack(rows: np.ndarray) -> np.ndarray:
+    """(n, 6) rows -> (6, n) block, storing timestamps as raw int64 bits."""
+    block = np.ascontiguousarray(rows.T, dtype=np.float64)
+    block[0] = rows[:, 0].astype(np.int64).view(np.float64)
+    return block
+
+
+# Shared store instance
+candle_store = CandleStore()
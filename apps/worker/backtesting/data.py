@@ -0,0 +1,159 @@
+"""Candle loading for backtests."""
+
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy import text
+
+from database import engine
+
+
+# Cast in SQL so rows arrive as plain floats/ints instead of Decimal/datetime objects
+CANDLE_RANGE_QUERY = text(
+    """
+    SELECT
+        CAST(EXTRACT(EPOCH FROM timestamp) AS BIGINT),
+        CAST(open AS DOUBLE PRECISION),
+        CAST(high AS DOUBLE PRECISION),
+        CAST(low AS DOUBLE PRECISION),
+        CAST(close AS DOUBLE PRECISION),
+        CAST(volume AS DOUBLE PRECISION)
+    FROM (
+        SELECT instrument_id, timeframe, timestamp, open, high, low, close, volume
+        FROM candles
+        UNION ALL
+        -- 1m candles moved out of cold partitions (see tasks.partitions)
+        SELECT instrument_id, timeframe, timestamp, open, high, low, close, volume
+        FROM candles_archive
+    ) AS candles
+    WHERE instrument_id = :instrument_id
+      AND timeframe = :timeframe
+      AND timestamp >= :start
+      AND timestamp <= :end
+    ORDER BY timestamp
+    """
+)
+
+
+class CandleArrays:
+    """
+    Columnar OHLCV data for one instrument and timeframe.
+    
+    Timestamps are int64 epoch seconds (UTC), prices and volume are float64.
+    """
+
+    def __init__(
+        self,
+        timestamp: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def slice(self, start: int, stop: int) -> "CandleArrays":
+        """Zero-copy view of rows [start, stop)."""
+        return CandleArrays(
+            timestamp=self.timestamp[start:stop],
+            open=self.open[start:stop],
+            high=self.high[start:stop],
+            low=self.low[start:stop],
+            close=self.close[start:stop],
+            volume=self.volume[start:stop],
+        )
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        """Columns keyed by name, as expected by `BaseStrategy.on_candles`."""
+        return {
+            "timestamp": self.timestamp,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+
+def load_candles(
+    instrument_id: str,
+    timeframe: str,
+    start: datetime,
+    end: datetime,
+    connection: Optional[object] = None,
+) -> CandleArrays:
+    """
+    Load a candle range as NumPy arrays.
+    
+    The local columnar store is synced from Postgres first and the range is
+    served from its memory-mapped file; if the store is unavailable the range
+    is fetched with a single query instead.
+    
+    Args:
+        instrument_id: Instrument UUID
+        timeframe: Candle timeframe ("1m", "5m", ...)
+        start: Range start (UTC, inclusive)
+        end: Range end (UTC, inclusive)
+        connection: Optional open SQLAlchemy connection to reuse
+        
+    Returns:
+        CandleArrays ordered by timestamp
+        
+    Raises:
+        ValueError: If no candles exist for the range
+    """
+    from .candle_store import candle_store
+    
+    try:
+        candle_store.sync(instrument_id, timeframe, connection=connection)
+        candles = candle_store.read(instrument_id, timeframe, start, end)
+    except OSError as e:
+        print(f"Warning: Candle store unavailable, querying database: {e}")
+    else:
+        if candles is None:
+            raise ValueError(
+                f"No {timeframe} candles for instrument {instrument_id} "
+                f"between {start.isoformat()} and {end.isoformat()}"
+            )
+        return candles
+    
+    params = {
+        "instrument_id": instrument_id,
+        "timeframe": timeframe,
+        "start": start,
+        "end": end,
+    }
+    
+    if connection is not None:
+        rows = connection.execute(CANDLE_RANGE_QUERY, params).fetchall()
+    else:
+        with engine.connect() as conn:
+            rows = conn.execute(CANDLE_RANGE_QUERY, params).fetchall()
+    
+    if not rows:
+        raise ValueError(
+            f"No {timeframe} candles for instrument {instrument_id} "
+            f"between {start.isoformat()} and {end.isoformat()}"
+        )
+    
+    # Epoch seconds fit exactly in float64, so one 2-D conversion is enough
+    data = np.array(rows, dtype=np.float64)
+    
+    return CandleArrays(
+        timestamp=data[:, 0].astype(np.int64),
+        open=np.ascontiguousarray(data[:, 1]),
+        high=np.ascontiguousarray(data[:, 2]),
+        low=np.ascontiguousarray(data[:, 3]),
+        close=np.ascontiguousarray(data[:, 4]),
+        volume=np.ascontiguousarray(data[:, 5]),
+    )
@@ -0,0 +1,81 @@
+"""Performance metrics for backtest results."""
+
+from typing import Any, Dict
+
+import numpy as np
+
+
+SECONDS_PER_YEAR = 365.25 * 24 * 60 * 60
+
+
+def compute_metrics(
+    result: Dict[str, np.ndarray],
+    timestamps: np.ndarray,
+    initial_capital: float,
+) -> Dict[str, Any]:
+    """
+    Compute summary metrics from a vectorized backtest result.
+    
+    Args:
+        result: Output of `run_vectorized_backtest`
+        timestamps: Candle timestamps (epoch seconds)
+        initial_capital: Starting equity
+        
+    Returns:
+        Metrics dictionary matching the `BacktestMetrics` schema, plus
+        total_return and final_equity
+    """
+    equity = result["equity"]
+    returns = result["returns"]
+    trade_pnl = result["trade_pnl"]
+    
+    final_equity = float(equity[-1]) if len(equity) else float(initial_capital)
+    total_return = final_equity / initial_capital - 1.0
+    
+    # CAGR over the calendar span of the data
+    years = float(timestamps[-1] - timestamps[0]) / SECONDS_PER_YEAR if len(timestamps) > 1 else 0.0
+    if years > 0 and final_equity > 0:
+        cagr = (final_equity / initial_capital) ** (1.0 / years) - 1.0
+    else:
+        cagr = 0.0
+    
+    # Annualized Sharpe from per-bar returns (risk-free rate = 0)
+    sharpe = 0.0
+    if len(returns) > 1:
+        std = returns.std(ddof=1)
+        bar_seconds = float(np.median(np.diff(timestamps)))
+        if std > 0 and bar_seconds > 0:
+            sharpe = returns.mean() / std * np.sqrt(SECONDS_PER_YEAR / bar_seconds)
+    
+    # Maximum drawdown (negative percentage)
+    running_peak = np.maximum.accumulate(equity) if len(equity) else equity
+    max_drawdown = float((equity / running_peak - 1.0).min()) if len(equity) else 0.0
+    
+    # Trade statistics
+    wins = trade_pnl[trade_pnl > 0]
+    losses = trade_pnl[trade_pnl < 0]
+    total_trades = len(trade_pnl)
+    gross_profit = float(wins.sum())
+    gross_loss = float(-losses.sum())
+    
+    win_rate = len(wins) / total_trades if total_trades else 0.0
+    avg_win = float(wins.mean()) if len(wins) else 0.0
+    avg_loss = float(losses.mean()) if len(losses) else 0.0
+    profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0.0
+    expectancy = float(trade_pnl.mean()) if total_trades else 0.0
+    
+    return {
+        "cagr": round(cagr * 100, 2),
+        "sharpe": round(float(sharpe), 2),
+        "max_drawdown": round(max_drawdown * 100, 2),
+        "win_rate": round(win_rate * 100, 2),
+        "total_trades": total_trades,
+        "winning_trades": len(wins),
+        "losing_trades": len(losses),
+        "avg_win": round(avg_win, 2),
+        "avg_loss": round(avg_loss, 2),
+        "profit_factor": round(profit_factor, 2),
+        "expectancy": round(expectancy, 2),
+        "total_return": round(total_return * 100, 2),
+        "final_equity": round(final_equity, 2),
+    }
@@ -0,0 +1,79 @@
+"""Monte Carlo trade-resampling risk report."""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Bound the (simulations x trades) matrix per chunk to ~16 MB of float64
+MAX_CHUNK_ELEMENTS = 2_000_000
+
+
+def _percentile_table(values: np.ndarray, scale: float = 1.0, digits: int = 2) -> Dict[str, float]:
+    points = np.percentile(values, PERCENTILES)
+    return {f"p{p}": round(float(v) * scale, digits) for p, v in zip(PERCENTILES, points)}
+
+
+def run_monte_carlo(
+    trade_returns: np.ndarray,
+    initial_capital: float,
+    simulations: int = 10000,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Bootstrap the trade return sequence into simulated equity paths.
+    
+    Each simulation draws `len(trade_returns)` trades with replacement and
+    compounds them. Paths are generated as (chunk x trades) matrices, so the
+    work is a few NumPy calls per chunk rather than a Python loop per path.
+    
+    Args:
+        trade_returns: Per-trade returns relative to equity at entry
+        initial_capital: Starting equity
+        simulations: Number of resampled paths
+        seed: RNG seed for reproducible reports
+        
+    Returns:
+        Percentile distributions of terminal equity, total return and maximum
+        drawdown, plus the probability of finishing below initial capital
+    """
+    trade_returns = np.asarray(trade_returns, dtype=np.float64)
+    n_trades = len(trade_returns)
+    
+    if n_trades == 0 or simulations <= 0:
+        return {"simulations": 0, "trades": n_trades}
+    
+    rng = np.random.default_rng(seed)
+    growth = 1.0 + trade_returns
+    terminal = np.empty(simulations)
+    max_drawdown = np.empty(simulations)
+    
+    chunk = max(1, min(simulations, MAX_CHUNK_ELEMENTS // n_trades))
+    for start in range(0, simulations, chunk):
+        stop = min(start + chunk, simulations)
+        
+        # Resample trades and compound along each row (equity relative to start)
+        paths = growth[rng.integers(0, n_trades, size=(stop - start, n_trades))]
+        np.cumprod(paths, axis=1, out=paths)
+        
+        # Peak includes the starting equity of 1.0
+        peaks = np.maximum.accumulate(paths, axis=1)
+        np.maximum(peaks, 1.0, out=peaks)
+        
+        terminal[start:stop] = paths[:, -1]
+        max_drawdown[start:stop] = (paths / peaks - 1.0).min(axis=1)
+    
+    # A path that never dips below its starting equity has zero drawdown
+    np.minimum(max_drawdown, 0.0, out=max_drawdown)
+    
+    return {
+        "simulations": simulations,
+        "trades": n_trades,
+        "terminal_equity": _percentile_table(terminal, initial_capital),
+        "total_return": _percentile_table(terminal - 1.0, 100),
+        "max_drawdown": _percentile_table(max_drawdown, 100),
+        "probability_of_loss": round(float((terminal < 1.0).mean()) * 100, 2),
+        "seed": seed,
+    }
@@ -0,0 +1,91 @@
+"""Process pool with candle arrays shared between workers."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .data import CandleArrays
+
+
+# Row order of the packed (6, n) float64 block in shared memory
+PACKED_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Upper bound on pool size (override with BACKTEST_POOL_SIZE)
+DEFAULT_POOL_SIZE = int(os.getenv("BACKTEST_POOL_SIZE", str(os.cpu_count() or 1)))
+
+# Candles visible to the current process (set in pool workers by `_attach_candles`)
+_worker_candles: Optional[CandleArrays] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+def _unpack(block: np.ndarray) -> CandleArrays:
+    """Build CandleArrays as views over a packed block."""
+    columns = dict(zip(PACKED_COLUMNS, block))
+    # Epoch seconds are exact in float64; one int64 copy per process
+    columns["timestamp"] = columns["timestamp"].astype(np.int64)
+    return CandleArrays(**columns)
+
+
+def _attach_candles(shm_name: str, length: int) -> None:
+    """Pool initializer: map the shared candle block into this worker."""
+    global _worker_candles, _worker_shm
+    
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray((len(PACKED_COLUMNS), length), dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_candles = _unpack(block)
+
+
+def get_worker_candles() -> CandleArrays:
+    """Candles shared with the current pool worker."""
+    if _worker_candles is None:
+        raise RuntimeError("No candles attached to this process")
+    return _worker_candles
+
+
+def set_worker_candles(candles: Optional[CandleArrays]) -> None:
+    """Use candles in-process (serial evaluation without a pool)."""
+    global _worker_candles
+    _worker_candles = candles
+
+
+@contextmanager
+def candle_pool(candles: CandleArrays, max_workers: Optional[int] = None) -> Iterator[ProcessPoolExecutor]:
+    """
+    Process pool whose workers all read one shared copy of the candles.
+    
+    The arrays are copied once into a shared memory block; workers attach to it
+    in their initializer, so submitted jobs only pickle their own parameters.
+    
+    Args:
+        candles: Candle arrays to share
+        max_workers: Pool size (defaults to BACKTEST_POOL_SIZE / CPU count)
+        
+    Yields:
+        ProcessPoolExecutor ready for `submit`/`map`
+    """
+    length = len(candles)
+    shape = (len(PACKED_COLUMNS), length)
+    shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for row, name in enumerate(PACKED_COLUMNS):
+            block[row] = getattr(candles, name)
+        del block
+        
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers or DEFAULT_POOL_SIZE,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_attach_candles,
+            initargs=(shm.name, length),
+        )
+        with executor:
+            yield executor
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,51 @@
+"""Strategy signal generation for backtests."""
+
+from typing import Any, Dict
+
+import numpy as np
+
+from strategies import get_strategy
+
+from .data import CandleArrays
+
+
+def signals_to_positions(signals: np.ndarray) -> np.ndarray:
+    """
+    Convert per-candle order signals into the position held after each candle.
+    
+    Args:
+        signals: 1 buy, -1 sell, 0 none (as returned by `BaseStrategy.on_candles`)
+        
+    Returns:
+        int8 array (1 long, -1 short, 0 flat before the first signal)
+    """
+    signals = np.asarray(signals, dtype=np.int8)
+    n = len(signals)
+    
+    # Forward-fill the last non-zero signal
+    last_signal = np.where(signals != 0, np.arange(n), -1)
+    np.maximum.accumulate(last_signal, out=last_signal)
+    
+    return np.where(last_signal >= 0, signals[last_signal], 0).astype(np.int8)
+
+
+def strategy_positions(
+    strategy_id: str, candles: CandleArrays, params: Dict[str, Any]
+) -> np.ndarray:
+    """
+    Run a strategy over a candle block through its batch `on_candles` API.
+    
+    Strategies with a vectorized override (e.g. ema_crossover) run without any
+    per-candle Python work; others fall back to replaying `on_candle`.
+    
+    Args:
+        strategy_id: Strategy identifier
+        candles: Candle arrays
+        params: Strategy parameters
+        
+    Returns:
+        int8 array with the position held after each candle
+    """
+    strategy = get_strategy(strategy_id, params)
+    signals = strategy.on_candles(candles.as_dict())
+    return signals_to_positions(signals)
@@ -0,0 +1,132 @@
+"""Parameter-sweep backtests."""
+
+import itertools
+from concurrent.futures import as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from .data import CandleArrays
+from .engine import run_vectorized_backtest, slippage_model_from_params
+from .metrics import compute_metrics
+from .parallel import DEFAULT_POOL_SIZE, candle_pool, get_worker_candles, set_worker_candles
+from .signals import strategy_positions
+
+
+# Sweeps at or below this size run in-process; pool startup would dominate
+SERIAL_SWEEP_THRESHOLD = 4
+
+
+def expand_param_grid(
+    base_params: Dict[str, Any], param_grid: Dict[str, List[Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into one params dict per combination.
+    
+    Args:
+        base_params: Fixed strategy parameters
+        param_grid: Parameter name -> list of values to try
+        
+    Returns:
+        List of parameter dictionaries (grid values override base params)
+    """
+    names = sorted(param_grid)
+    return [
+        {**base_params, **dict(zip(names, values))}
+        for values in itertools.product(*(param_grid[name] for name in names))
+    ]
+
+
+def backtest_params(
+    strategy_id: str, candles: CandleArrays, params: Dict[str, Any], initial_capital: float
+) -> Dict[str, Any]:
+    """
+    Backtest one parameter set on the given candles.
+    
+    Returns:
+        Dictionary with params and metrics
+    """
+    positions = strategy_positions(strategy_id, candles, params)
+    result = run_vectorized_backtest(
+        candles.close,
+        positions,
+        initial_capital,
+        position_size=float(params.get("position_size", 0.1)),
+        slippage_model=slippage_model_from_params(params),
+    )
+    return {
+        "params": params,
+        "metrics": compute_metrics(result, candles.timestamp, initial_capital),
+    }
+
+
+def evaluate_params(
+    strategy_id: str, params: Dict[str, Any], initial_capital: float
+) -> Dict[str, Any]:
+    """Backtest one parameter set against the process's shared candles."""
+    return backtest_params(strategy_id, get_worker_candles(), params, initial_capital)
+
+
+def rank_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rank sweep results by Sharpe ratio, then total return (best first)."""
+    ranked = sorted(
+        results,
+        key=lambda r: (r["metrics"]["sharpe"], r["metrics"]["total_return"]),
+        reverse=True,
+    )
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+    return ranked
+
+
+def run_parameter_sweep(
+    strategy_id: str,
+    candles: CandleArrays,
+    base_params: Dict[str, Any],
+    param_grid: Dict[str, List[Any]],
+    initial_capital: float,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate every grid combination and return a ranked table.
+    
+    The candle arrays are loaded once by the caller and shared with the pool
+    workers, so no combination re-queries or re-pickles the data.
+    
+    Args:
+        strategy_id: Strategy identifier
+        candles: Candle arrays for the whole range
+        base_params: Fixed strategy parameters
+        param_grid: Parameter name -> list of values
+        initial_capital: Starting equity
+        max_workers: Pool size override
+        progress_callback: Called with (completed, total) as results arrive
+        
+    Returns:
+        Results ranked best first, each with rank, params and metrics
+    """
+    combinations = expand_param_grid(base_params, param_grid)
+    total = len(combinations)
+    results = []
+    
+    if total <= SERIAL_SWEEP_THRESHOLD or max_workers == 1:
+        set_worker_candles(candles)
+        try:
+            for params in combinations:
+                results.append(evaluate_params(strategy_id, params, initial_capital))
+                if progress_callback:
+                    progress_callback(len(results), total)
+        finally:
+            set_worker_candles(None)
+        return rank_results(results)
+    
+    with candle_pool(candles, min(max_workers or DEFAULT_POOL_SIZE, total)) as pool:
+        futures = [
+            pool.submit(evaluate_params, strategy_id, params, initial_capital)
+            for params in combinations
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if progress_callback:
+                progress_callback(len(results), total)
+    
+    return rank_results(results)
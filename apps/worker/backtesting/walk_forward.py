@@ -0,0 +1,244 @@
+"""Walk-forward optimization."""
+
+from concurrent.futures import as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .data import CandleArrays
+from .engine import run_vectorized_backtest, slippage_model_from_params
+from .metrics import compute_metrics
+from .parallel import DEFAULT_POOL_SIZE, candle_pool, get_worker_candles, set_worker_candles
+from .signals import strategy_positions
+from .sweep import backtest_params, expand_param_grid, rank_results
+
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def build_windows(
+    timestamps: np.ndarray,
+    in_sample_days: float,
+    out_of_sample_days: float,
+    anchored: bool = False,
+) -> List[Tuple[int, int, int]]:
+    """
+    Split a candle range into rolling in-sample / out-of-sample windows.
+    
+    Windows advance by the out-of-sample length, so out-of-sample segments
+    are contiguous and never overlap. With `anchored`, every in-sample window
+    starts at the beginning of the data (expanding window).
+    
+    Args:
+        timestamps: Candle timestamps (epoch seconds, ascending)
+        in_sample_days: In-sample window length
+        out_of_sample_days: Out-of-sample window length (and step)
+        anchored: Keep the in-sample start fixed
+        
+    Returns:
+        List of (in_sample_start, out_of_sample_start, out_of_sample_end) row
+        indices; in-sample rows are [in_sample_start, out_of_sample_start)
+    """
+    in_sample = in_sample_days * SECONDS_PER_DAY
+    out_of_sample = out_of_sample_days * SECONDS_PER_DAY
+    first, last = timestamps[0], timestamps[-1]
+    
+    windows = []
+    k = 0
+    while first + in_sample + k * out_of_sample < last:
+        is_start_time = first if anchored else first + k * out_of_sample
+        oos_start_time = first + in_sample + k * out_of_sample
+        oos_end_time = oos_start_time + out_of_sample
+        
+        is_start, oos_start, oos_end = np.searchsorted(
+            timestamps, [is_start_time, oos_start_time, oos_end_time], side="left"
+        )
+        
+        # Need at least two bars on each side to produce a return
+        if oos_start - is_start >= 2 and oos_end - oos_start >= 2:
+            windows.append((int(is_start), int(oos_start), int(oos_end)))
+        k += 1
+    
+    return windows
+
+
+def _isoformat(timestamp: int) -> str:
+    return datetime.utcfromtimestamp(int(timestamp)).isoformat()
+
+
+def optimize_window(
+    strategy_id: str,
+    combinations: List[Dict[str, Any]],
+    initial_capital: float,
+    window: Tuple[int, int, int],
+) -> Dict[str, Any]:
+    """
+    Optimize on one in-sample window and score the winner out-of-sample.
+    
+    Runs against the process's shared candles. The out-of-sample run reuses
+    the in-sample bars for indicator warm-up, but only bars from the
+    out-of-sample start onward count towards its returns.
+    
+    Returns:
+        Window summary plus the raw out-of-sample returns and trade P&L
+    """
+    is_start, oos_start, oos_end = window
+    candles = get_worker_candles()
+    in_sample = candles.slice(is_start, oos_start)
+    
+    ranked = rank_results(
+        [backtest_params(strategy_id, in_sample, params, initial_capital) for params in combinations]
+    )
+    best = ranked[0]
+    
+    # Positions over in-sample + out-of-sample so indicators are warmed up
+    span = candles.slice(is_start, oos_end)
+    positions = strategy_positions(strategy_id, span, best["params"])
+    
+    # Start one bar early so the first out-of-sample bar's return is included
+    offset = oos_start - is_start - 1
+    result = run_vectorized_backtest(
+        span.close[offset:],
+        positions[offset:],
+        initial_capital,
+        position_size=float(best["params"].get("position_size", 0.1)),
+        slippage_model=slippage_model_from_params(best["params"]),
+    )
+    oos_timestamps = span.timestamp[offset:]
+    
+    return {
+        "window": list(window),
+        "in_sample_start": _isoformat(in_sample.timestamp[0]),
+        "in_sample_end": _isoformat(in_sample.timestamp[-1]),
+        "out_of_sample_start": _isoformat(candles.timestamp[oos_start]),
+        "out_of_sample_end": _isoformat(candles.timestamp[oos_end - 1]),
+        "best_params": best["params"],
+        "in_sample_metrics": best["metrics"],
+        "out_of_sample_metrics": compute_metrics(result, oos_timestamps, initial_capital),
+        "returns": result["returns"],
+        "trade_pnl": result["trade_pnl"],
+        "trade_returns": result["trade_returns"],
+        "timestamps": oos_timestamps,
+    }
+
+
+def stitch_out_of_sample(
+    windows: List[Dict[str, Any]], initial_capital: float
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Chain the out-of-sample segments into one equity curve.
+    
+    Each window is simulated from `initial_capital`; scaling its trade P&L by
+    the stitched equity at the window's start makes the amounts consistent.
+    
+    Returns:
+        (result dict compatible with `compute_metrics`, timestamps)
+    """
+    returns = np.concatenate([w["returns"] for w in windows])
+    equity = np.empty(len(returns) + 1)
+    equity[0] = initial_capital
+    np.cumprod(1.0 + returns, out=equity[1:])
+    equity[1:] *= initial_capital
+    
+    trade_pnl = []
+    position = 0
+    for w in windows:
+        scale = equity[position] / initial_capital
+        trade_pnl.append(w["trade_pnl"] * scale)
+        position += len(w["returns"])
+    
+    timestamps = np.concatenate(
+        [windows[0]["timestamps"][:1]] + [w["timestamps"][1:] for w in windows]
+    )
+    
+    result = {
+        "equity": equity,
+        "returns": returns,
+        "trade_pnl": np.concatenate(trade_pnl),
+        "trade_returns": np.concatenate([w["trade_returns"] for w in windows]),
+    }
+    return result, timestamps
+
+
+def run_walk_forward(
+    strategy_id: str,
+    candles: CandleArrays,
+    base_params: Dict[str, Any],
+    param_grid: Dict[str, List[Any]],
+    initial_capital: float,
+    in_sample_days: float,
+    out_of_sample_days: float,
+    anchored: bool = False,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Walk-forward optimization over a single candle load.
+    
+    Windows are optimized in parallel by a process pool sharing the candle
+    arrays; the out-of-sample segments are then stitched into one curve.
+    
+    Args:
+        strategy_id: Strategy identifier
+        candles: Candle arrays for the whole range
+        base_params: Fixed strategy parameters
+        param_grid: Parameter name -> values optimized on each in-sample window
+        initial_capital: Starting equity
+        in_sample_days: In-sample window length in days
+        out_of_sample_days: Out-of-sample window length (and step) in days
+        anchored: Use an expanding in-sample window
+        max_workers: Pool size override
+        progress_callback: Called with (completed, total) windows
+        
+    Returns:
+        Dictionary with stitched out-of-sample metrics and per-window results
+        
+    Raises:
+        ValueError: If the range is too short for a single window
+    """
+    windows = build_windows(candles.timestamp, in_sample_days, out_of_sample_days, anchored)
+    if not windows:
+        raise ValueError(
+            "Date range is too short for the requested in-sample/out-of-sample windows"
+        )
+    
+    combinations = expand_param_grid(base_params, param_grid)
+    total = len(windows)
+    results = []
+    
+    if total == 1 or max_workers == 1:
+        set_worker_candles(candles)
+        try:
+            for window in windows:
+                results.append(optimize_window(strategy_id, combinations, initial_capital, window))
+                if progress_callback:
+                    progress_callback(len(results), total)
+        finally:
+            set_worker_candles(None)
+    else:
+        with candle_pool(candles, min(max_workers or DEFAULT_POOL_SIZE, total)) as pool:
+            futures = [
+                pool.submit(optimize_window, strategy_id, combinations, initial_capital, window)
+                for window in windows
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if progress_callback:
+                    progress_callback(len(results), total)
+    
+    results.sort(key=lambda r: r["window"][1])
+    stitched, timestamps = stitch_out_of_sample(results, initial_capital)
+    
+    return {
+        "metrics": compute_metrics(stitched, timestamps, initial_capital),
+        "result": stitched,
+        "windows": [
+            {
+                key: value
+                for key, value in r.items()
+                if key not in ("returns", "trade_pnl", "trade_returns", "timestamps")
+            }
+            for r in results
+        ],
+    }
@@ -1,16 +1,22 @@
 from celery import Celery
 import os
+import sys
 
 # Get environment variables
 BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/1")
+AGENT_PATH = os.getenv("AGENT_PATH", "/agent")
+
+# Make the agent strategies importable (mounted at /agent in docker-compose)
+if AGENT_PATH not in sys.path:
+    sys.path.append(AGENT_PATH)
 
 # Create Celery app
 app = Celery(
     "tunicoin_worker",
     broker=BROKER_URL,
     backend=RESULT_BACKEND,
-    include=["tasks.backtest", "tasks.bot", "tasks.notifications"],
+    include=["tasks.backtest", "tasks.bot", "tasks.candles", "tasks.ledger", "tasks.notifications", "tasks.partitions", "tasks.positions"],
 )
 
 # Configure Celery
@@ -25,6 +31,28 @@ app.conf.update(
     task_soft_time_limit=3000,  # 50 minutes soft limit
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=100,
+    beat_schedule={
+        "rollup-candles": {
+            "task": "tasks.candles.rollup_candles",
+            "schedule": 60.0,  # every minute, as 1m candles close
+        },
+        "mark-to-market": {
+            "task": "tasks.positions.mark_to_market",
+            "schedule": 60.0,
+        },
+        "checkpoint-ledgers": {
+            "task": "tasks.ledger.checkpoint_ledgers",
+            "schedule": 3600.0,  # hourly keeps reconciliation tails short
+        },
+        "ensure-partitions": {
+            "task": "tasks.partitions.ensure_partitions",
+            "schedule": 86400.0,
+        },
+        "archive-candles": {
+            "task": "tasks.partitions.archive_candles",
+            "schedule": 86400.0,
+        },
+    },
 )
 
 if __name__ == "__main__":
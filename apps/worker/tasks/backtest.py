@@ -1,37 +1,211 @@
 from celery_app import app
-import time
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import JSON, column, table, update
+
+from database import engine
+from backtesting import (
+    load_candles,
+    strategy_positions,
+    run_vectorized_backtest,
+    slippage_model_from_params,
+    compute_metrics,
+    run_parameter_sweep,
+    run_walk_forward,
+    run_monte_carlo,
+)
+
+
+# Lightweight table construct - the worker does not import the API models
+backtests_table = table(
+    "backtests",
+    column("id"),
+    column("status"),
+    column("progress"),
+    column("metrics", JSON),
+    column("monte_carlo", JSON),
+    column("error_message"),
+    column("started_at"),
+    column("completed_at"),
+)
+
+
+def _update_backtest(backtest_id: str, **values: Any) -> None:
+    """Persist backtest status fields."""
+    with engine.begin() as conn:
+        conn.execute(
+            update(backtests_table)
+            .where(backtests_table.c.id == backtest_id)
+            .values(**values)
+        )
+
+
+def _report_progress(task, backtest_id: str, fraction: float, persist: bool = True) -> None:
+    """Publish progress to Celery and, optionally, the backtest record."""
+    task.update_state(
+        state="PROGRESS", meta={"current": int(fraction * 100), "total": 100}
+    )
+    if persist:
+        _update_backtest(backtest_id, progress=round(fraction, 2))
+
+
+def _simulate(strategy_id: str, candles, strategy_params: Dict[str, Any], initial_capital: float):
+    """Signals -> positions -> equity for one parameter set."""
+    positions = strategy_positions(strategy_id, candles, strategy_params)
+    return run_vectorized_backtest(
+        candles.close,
+        positions,
+        initial_capital,
+        position_size=float(strategy_params.get("position_size", 0.1)),
+        slippage_model=slippage_model_from_params(strategy_params),
+    )
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Parse an ISO timestamp from the task payload into naive UTC."""
+    parsed = datetime.fromisoformat(value)
+    return parsed.replace(tzinfo=None) if parsed.tzinfo else parsed
 
 
 @app.task(bind=True, name="tasks.backtest.run_backtest")
-def run_backtest(self, strategy_id: str, params: dict):
+def run_backtest(self, backtest_id: str, params: Dict[str, Any]):
     """
-    Run a backtest job for a given strategy.
+    Run a backtest job.
     
-    This is a placeholder that will be implemented in Phase 6.
+    Loads the candle range in one query, runs the strategy's vectorized
+    signal -> position -> equity pipeline and stores the metrics on the
+    backtest record. When the payload has a `param_grid`, every combination
+    is evaluated across a process pool sharing the same candle arrays and
+    the ranked table is stored under `metrics["sweep_results"]`. With a
+    `walk_forward` config the grid is instead optimized per in-sample window
+    and the stitched out-of-sample results are stored. A non-zero
+    `monte_carlo_simulations` adds a trade-resampling risk report.
+    
+    Args:
+        backtest_id: Backtest record ID
+        params: Job payload (strategy_id, instrument_id, params, start_date,
+            end_date, initial_capital, timeframe, param_grid, walk_forward,
+            monte_carlo_simulations, monte_carlo_seed)
     """
     try:
-        # Update task state
         self.update_state(state="PROGRESS", meta={"current": 0, "total": 100})
+        _update_backtest(
+            backtest_id,
+            status="running",
+            progress=0.0,
+            started_at=datetime.utcnow(),
+        )
+        
+        strategy_id = params["strategy_id"]
+        strategy_params = params.get("params") or {}
+        param_grid = params.get("param_grid")
+        walk_forward = params.get("walk_forward")
+        initial_capital = float(params.get("initial_capital", 10000.0))
+        monte_carlo_simulations = int(params.get("monte_carlo_simulations") or 0)
+        
+        # Load candles once for every evaluation
+        candles = load_candles(
+            params["instrument_id"],
+            params.get("timeframe", "1m"),
+            _parse_datetime(params["start_date"]),
+            _parse_datetime(params["end_date"]),
+        )
+        _report_progress(self, backtest_id, 0.4)
         
-        # Simulate backtest execution
-        for i in range(10):
-            time.sleep(0.5)
-            self.update_state(
-                state="PROGRESS", meta={"current": (i + 1) * 10, "total": 100}
+        def on_progress(completed: int, total: int) -> None:
+            # Persist roughly every 10% to keep DB writes bounded
+            step = max(total // 10, 1)
+            _report_progress(
+                self,
+                backtest_id,
+                0.4 + 0.55 * completed / total,
+                persist=completed % step == 0,
+            )
+        
+        if walk_forward:
+            wf = run_walk_forward(
+                strategy_id,
+                candles,
+                strategy_params,
+                param_grid,
+                initial_capital,
+                in_sample_days=float(walk_forward["in_sample_days"]),
+                out_of_sample_days=float(walk_forward["out_of_sample_days"]),
+                anchored=bool(walk_forward.get("anchored", False)),
+                progress_callback=on_progress,
+            )
+            metrics = {
+                **wf["metrics"],
+                "walk_forward_windows": wf["windows"],
+            }
+            trade_returns = wf["result"]["trade_returns"]
+        elif param_grid:
+            ranked = run_parameter_sweep(
+                strategy_id,
+                candles,
+                strategy_params,
+                param_grid,
+                initial_capital,
+                progress_callback=on_progress,
             )
+            best = ranked[0]
+            metrics = {
+                **best["metrics"],
+                "best_params": best["params"],
+                "combinations": len(ranked),
+                "sweep_results": ranked,
+            }
+            # Only the arrays of the winning combination are needed (for Monte Carlo)
+            trade_returns = None
+        else:
+            result = _simulate(strategy_id, candles, strategy_params, initial_capital)
+            _report_progress(self, backtest_id, 0.8, persist=False)
+            metrics = compute_metrics(result, candles.timestamp, initial_capital)
+            trade_returns = result["trade_returns"]
+        
+        metrics["candles"] = len(candles)
+        
+        # Optional Monte Carlo risk report
+        monte_carlo = None
+        if monte_carlo_simulations > 0:
+            if trade_returns is None:
+                trade_returns = _simulate(
+                    strategy_id, candles, metrics["best_params"], initial_capital
+                )["trade_returns"]
+            monte_carlo = run_monte_carlo(
+                trade_returns,
+                initial_capital,
+                simulations=monte_carlo_simulations,
+                seed=params.get("monte_carlo_seed"),
+            )
+        
+        _update_backtest(
+            backtest_id,
+            status="completed",
+            progress=1.0,
+            metrics=metrics,
+            monte_carlo=monte_carlo,
+            completed_at=datetime.utcnow(),
+        )
         
-        # Return mock results
         return {
             "status": "completed",
+            "backtest_id": backtest_id,
             "strategy_id": strategy_id,
-            "metrics": {
-                "cagr": 15.5,
-                "sharpe": 1.8,
-                "max_drawdown": -12.3,
-                "win_rate": 62.5,
-            },
-            "trades_count": 150,
+            "metrics": metrics,
+            "monte_carlo": monte_carlo,
+            "trades_count": metrics["total_trades"],
         }
     except Exception as e:
+        try:
+            _update_backtest(
+                backtest_id,
+                status="failed",
+                error_message=str(e)[:1000],
+                completed_at=datetime.utcnow(),
+            )
+        except Exception as db_error:
+            print(f"Warning: Could not record backtest failure: {db_error}")
         self.update_state(state="FAILURE", meta={"error": str(e)})
         raise
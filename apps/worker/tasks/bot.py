@@ -1,4 +1,23 @@
+from typing import Optional
+
 from celery_app import app
+from backtesting import CandleArrays, candle_store
+
+# Candles replayed into a strategy before it starts trading live
+WARMUP_CANDLES = 500
+
+
+def load_warmup_candles(
+    instrument_id: str, timeframe: str = "1m", count: int = WARMUP_CANDLES
+) -> Optional[CandleArrays]:
+    """
+    Latest candles for priming a bot's indicators.
+    
+    Syncs the columnar candle store and returns zero-copy views of its tail,
+    ready for `BaseStrategy.on_candles(candles.as_dict())`.
+    """
+    candle_store.sync(instrument_id, timeframe)
+    return candle_store.tail(instrument_id, timeframe, count)
 
 
 @app.task(name="tasks.bot.execute_strategy")
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+
+from celery_app import app
+from database import engine
+
+
+EPOCH = datetime(1970, 1, 1)
+
+# Each timeframe is rolled up from the next lower one, in this order
+ROLLUPS = [
+    ("5m", "1m", timedelta(minutes=5)),
+    ("15m", "5m", timedelta(minutes=15)),
+    ("1h", "15m", timedelta(hours=1)),
+    ("4h", "1h", timedelta(hours=4)),
+    ("1d", "4h", timedelta(days=1)),
+]
+BASE_TIMEFRAME = "1m"
+BASE_INTERVAL = timedelta(minutes=1)
+
+LATEST_BASE_CANDLE_QUERY = text(
+    """
+    SELECT max(timestamp) FROM candles
+    WHERE instrument_id = :instrument_id AND timeframe = :timeframe
+    """
+)
+
+WATERMARKS_QUERY = text(
+    """
+    SELECT timeframe, watermark FROM candle_rollup_watermarks
+    WHERE instrument_id = :instrument_id
+    """
+)
+
+# Buckets are aligned to the Unix epoch, so 4h/1d candles start at 00:00 UTC
+ROLLUP_QUERY = text(
+    """
+    INSERT INTO candles (id, instrument_id, timeframe, timestamp, open, high, low, close, volume, created_at)
+    SELECT
+        gen_random_uuid(),
+        instrument_id,
+        :timeframe,
+        date_bin(:bucket, timestamp, TIMESTAMP '1970-01-01') AS bucket_start,
+        (array_agg(open ORDER BY timestamp))[1],
+        max(high),
+        min(low),
+        (array_agg(close ORDER BY timestamp DESC))[1],
+        sum(volume),
+        :now
+    FROM candles
+    WHERE instrument_id = :instrument_id
+      AND timeframe = :source_timeframe
+      AND timestamp >= :since
+      AND timestamp < :until
+    GROUP BY instrument_id, bucket_start
+    ON CONFLICT (instrument_id, timeframe, timestamp) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume
+    """
+)
+
+UPSERT_WATERMARK_QUERY = text(
+    """
+    INSERT INTO candle_rollup_watermarks (instrument_id, timeframe, watermark, updated_at)
+    VALUES (:instrument_id, :timeframe, :watermark, :now)
+    ON CONFLICT (instrument_id, timeframe) DO UPDATE SET
+        watermark = EXCLUDED.watermark,
+        updated_at = EXCLUDED.updated_at
+    """
+)
+
+
+def _floor(value: datetime, interval: timedelta) -> datetime:
+    """Start of the epoch-aligned bucket containing `value`."""
+    return EPOCH + ((value - EPOCH) // interval) * interval
+
+
+def rollup_instrument(connection, instrument_id: str, rebuild: bool = False) -> dict:
+    """
+    Roll closed candles of one instrument up into every higher timeframe.
+    
+    Only buckets between the stored watermark and the last fully closed bucket
+    are recomputed, so a run touches a few rows per timeframe.
+    
+    Args:
+        connection: Open SQLAlchemy connection (inside a transaction)
+        instrument_id: Instrument UUID
+        rebuild: Ignore watermarks and recompute all history
+        
+    Returns:
+        Rows written per timeframe
+    """
+    latest = connection.execute(
+        LATEST_BASE_CANDLE_QUERY,
+        {"instrument_id": instrument_id, "timeframe": BASE_TIMEFRAME},
+    ).scalar()
+    if latest is None:
+        return {}
+    
+    now = datetime.utcnow()
+    watermarks = {} if rebuild else dict(
+        connection.execute(WATERMARKS_QUERY, {"instrument_id": instrument_id}).fetchall()
+    )
+    
+    # A 1m candle is closed once its minute has passed
+    source_horizon = min(latest + BASE_INTERVAL, _floor(now, BASE_INTERVAL))
+    written = {}
+    
+    for timeframe, source_timeframe, interval in ROLLUPS:
+        since = watermarks.get(timeframe, EPOCH)
+        until = _floor(source_horizon, interval)
+        
+        if until > since:
+            result = connection.execute(
+                ROLLUP_QUERY,
+                {
+                    "instrument_id": instrument_id,
+                    "timeframe": timeframe,
+                    "source_timeframe": source_timeframe,
+                    "bucket": interval,
+                    "since": since,
+                    "until": until,
+                    "now": now,
+                },
+            )
+            connection.execute(
+                UPSERT_WATERMARK_QUERY,
+                {
+                    "instrument_id": instrument_id,
+                    "timeframe": timeframe,
+                    "watermark": until,
+                    "now": now,
+                },
+            )
+            written[timeframe] = result.rowcount
+        
+        # Higher timeframes only consume closed buckets of this one
+        source_horizon = max(until, since)
+    
+    return written
+
+
+@app.task(name="tasks.candles.rollup_candles")
+def rollup_candles(instrument_id: Optional[str] = None, rebuild: bool = False):
+    """
+    Incrementally aggregate 1m candles into 5m/15m/1h/4h/1d.
+    
+    Runs periodically via Celery beat; each instrument is rolled up in its
+    own transaction.
+    """
+    with engine.connect() as conn:
+        if instrument_id:
+            instrument_ids = [instrument_id]
+        else:
+            instrument_ids = [
+                str(row[0])
+                for row in conn.execute(
+                    text("SELECT id FROM instruments WHERE is_active")
+                ).fetchall()
+            ]
+    
+    results = {}
+    for iid in instrument_ids:
+        with engine.begin() as conn:
+            results[iid] = rollup_instrument(conn, iid, rebuild=rebuild)
+    
+    return {"status": "success", "instruments": results}
@@ -0,0 +1,84 @@
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from celery_app import app
+from database import engine
+
+
+# Only entries older than this are checkpointed, so transactions still in
+# flight cannot commit entries behind a checkpoint
+CHECKPOINT_LAG_SECONDS = float(os.getenv("LEDGER_CHECKPOINT_LAG_SECONDS", "300"))
+
+
+# Advance each account's checkpoint over the entries recorded since it, up to
+# the cutoff. Each account reads only its own tail via the
+# (account_id, created_at, id) index.
+CHECKPOINT_QUERY = text(
+    """
+    WITH tails AS (
+        SELECT accounts.id AS account_id,
+               tail.entries_count, tail.ledger_sum,
+               last_entry.id AS last_entry_id,
+               last_entry.created_at AS last_entry_at,
+               last_entry.balance_after
+        FROM accounts
+        LEFT JOIN ledger_checkpoints ON ledger_checkpoints.account_id = accounts.id
+        JOIN LATERAL (
+            SELECT count(*) AS entries_count, coalesce(sum(amount), 0) AS ledger_sum
+            FROM ledger_entries
+            WHERE ledger_entries.account_id = accounts.id
+              AND (ledger_entries.created_at, ledger_entries.id) > (
+                  coalesce(ledger_checkpoints.last_entry_at, '-infinity'::timestamp),
+                  coalesce(ledger_checkpoints.last_entry_id, '00000000-0000-0000-0000-000000000000'::uuid)
+              )
+              AND ledger_entries.created_at < :cutoff
+        ) AS tail ON tail.entries_count > 0
+        JOIN LATERAL (
+            SELECT id, created_at, balance_after
+            FROM ledger_entries
+            WHERE ledger_entries.account_id = accounts.id
+              AND ledger_entries.created_at < :cutoff
+            ORDER BY created_at DESC, id DESC
+            LIMIT 1
+        ) AS last_entry ON true
+    )
+    INSERT INTO ledger_checkpoints (
+        account_id, last_entry_id, last_entry_at,
+        entries_count, ledger_sum, balance_after, created_at
+    )
+    SELECT account_id, last_entry_id, last_entry_at,
+           entries_count, ledger_sum, balance_after, :now
+    FROM tails
+    ON CONFLICT (account_id) DO UPDATE SET
+        last_entry_id = EXCLUDED.last_entry_id,
+        last_entry_at = EXCLUDED.last_entry_at,
+        entries_count = ledger_checkpoints.entries_count + EXCLUDED.entries_count,
+        ledger_sum = ledger_checkpoints.ledger_sum + EXCLUDED.ledger_sum,
+        balance_after = EXCLUDED.balance_after,
+        created_at = EXCLUDED.created_at
+    RETURNING account_id
+    """
+)
+
+
+@app.task(name="tasks.ledger.checkpoint_ledgers")
+def checkpoint_ledgers():
+    """
+    Advance every account's ledger checkpoint.
+    
+    Runs periodically via Celery beat, so reconciliation only has to read
+    entries recorded since the last run.
+    """
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        rows = conn.execute(
+            CHECKPOINT_QUERY,
+            {"cutoff": now - timedelta(seconds=CHECKPOINT_LAG_SECONDS), "now": now},
+        ).fetchall()
+    
+    return {
+        "status": "success",
+        "accounts": len(rows),
+    }
@@ -0,0 +1,150 @@
+import os
+import re
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import text
+
+from celery_app import app
+from database import engine
+
+
+# Monthly range-partitioned tables and their partition keys (see migration 014;
+# candles_archive, from migration 015, gets partitions only when archiving).
+# Partitions are named <table>_pYYYY_MM.
+PARTITIONED_TABLES = {
+    "ledger_entries": "created_at",
+    "candles": "timestamp",
+}
+PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+
+# Partitions kept ready ahead of the current month
+FUTURE_MONTHS = int(os.getenv("PARTITION_FUTURE_MONTHS", "3"))
+
+# 1m candles older than this many whole months move to the archive table
+CANDLE_HOT_MONTHS = int(os.getenv("CANDLE_HOT_MONTHS", "3"))
+ARCHIVE_TIMEFRAME = "1m"
+ARCHIVE_TABLE = "candles_archive"
+CANDLE_COLUMNS = (
+    "id, instrument_id, timeframe, timestamp, "
+    "open, high, low, close, volume, created_at"
+)
+
+PARTITIONS_QUERY = text(
+    """
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table
+    """
+)
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    years, month = divmod(value.month - 1 + months, 12)
+    return value.replace(year=value.year + years, month=month + 1)
+
+
+def _partitions(conn, table: str) -> Dict[datetime, str]:
+    """Monthly partitions of a table, keyed by month start."""
+    partitions = {}
+    for (name,) in conn.execute(PARTITIONS_QUERY, {"table": table}):
+        match = PARTITION_NAME.search(name)
+        if match:
+            partitions[datetime(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+@app.task(name="tasks.partitions.ensure_partitions")
+def ensure_partitions():
+    """
+    Create the monthly partitions for the next few months.
+    
+    Runs daily via Celery beat so inserts never fall through to the default
+    partition.
+    """
+    current = _month_start(datetime.utcnow())
+    created = []
+    
+    for table in PARTITIONED_TABLES:
+        with engine.connect() as conn:
+            existing = _partitions(conn, table)
+        
+        for offset in range(FUTURE_MONTHS + 1):
+            month = _add_months(current, offset)
+            if month in existing:
+                continue
+            
+            name = f"{table}_p{month:%Y_%m}"
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+                        f"TO ('{_add_months(month, 1):%Y-%m-%d}')"
+                    ))
+                created.append(name)
+            except Exception as e:
+                # e.g. rows for that month already sit in the default partition
+                print(f"Warning: Could not create partition {name}: {e}")
+    
+    return {
+        "status": "success",
+        "created": created,
+    }
+
+
+@app.task(name="tasks.partitions.archive_candles")
+def archive_candles():
+    """
+    Move 1m candles out of cold monthly partitions into candles_archive.
+    
+    Each cold month's 1m rows are copied into its own candles_archive
+    partition and deleted from candles in the same transaction, so hot
+    indexes stay small without losing data. Higher timeframes stay in
+    candles. The candle store syncs from both tables, so backtests on any
+    worker still see the archived history.
+    """
+    cutoff = _add_months(_month_start(datetime.utcnow()), -CANDLE_HOT_MONTHS)
+    
+    with engine.connect() as conn:
+        partitions = _partitions(conn, "candles")
+        archive_partitions = _partitions(conn, ARCHIVE_TABLE)
+    
+    archived = []
+    for month, name in sorted(partitions.items()):
+        end = _add_months(month, 1)
+        if end > cutoff:
+            continue
+        
+        with engine.begin() as conn:
+            if month not in archive_partitions:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {ARCHIVE_TABLE}_p{month:%Y_%m} "
+                    f"PARTITION OF {ARCHIVE_TABLE} "
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+                ))
+            
+            moved = conn.execute(
+                text(
+                    f"WITH moved AS ("
+                    f"DELETE FROM {name} WHERE timeframe = :timeframe "
+                    f"RETURNING {CANDLE_COLUMNS}"
+                    f") INSERT INTO {ARCHIVE_TABLE} ({CANDLE_COLUMNS}) "
+                    f"SELECT {CANDLE_COLUMNS} FROM moved"
+                ),
+                {"timeframe": ARCHIVE_TIMEFRAME},
+            ).rowcount
+        
+        if moved:
+            archived.append(name)
+    
+    return {
+        "status": "success",
+        "archived": archived,
+    }
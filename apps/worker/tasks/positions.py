@@ -0,0 +1,102 @@
+import os
+from datetime import datetime
+
+from sqlalchemy import text
+
+from celery_app import app
+from database import engine
+
+
+# Accounts re-priced per transaction, so row locks on open positions are
+# held for one chunk at a time rather than across the whole platform
+ACCOUNTS_PER_CHUNK = int(os.getenv("MARK_TO_MARKET_ACCOUNTS_PER_CHUNK", "500"))
+
+# Next chunk of accounts with open positions, in account ID order
+ACCOUNT_CHUNK_QUERY = text(
+    """
+    SELECT DISTINCT account_id FROM positions
+    WHERE is_open
+      AND (CAST(:after AS uuid) IS NULL OR account_id > CAST(:after AS uuid))
+    ORDER BY account_id
+    LIMIT :limit
+    """
+)
+
+# Re-price a chunk of accounts' open positions from the latest 1m close in
+# one statement and return per-account unrealized P&L
+MARK_TO_MARKET_QUERY = text(
+    """
+    WITH latest_prices AS (
+        SELECT open_instruments.instrument_id, latest.close AS price
+        FROM (
+            SELECT DISTINCT instrument_id FROM positions
+            WHERE is_open AND account_id = ANY(CAST(:account_ids AS uuid[]))
+        ) AS open_instruments
+        JOIN LATERAL (
+            SELECT close FROM candles
+            WHERE candles.instrument_id = open_instruments.instrument_id
+              AND candles.timeframe = '1m'
+            ORDER BY candles.timestamp DESC
+            LIMIT 1
+        ) AS latest ON true
+    ),
+    updated AS (
+        UPDATE positions
+        SET current_price = latest_prices.price,
+            unrealized_pnl = CASE
+                WHEN positions.side = 'long'
+                    THEN (latest_prices.price - positions.entry_price) * positions.size
+                ELSE (positions.entry_price - latest_prices.price) * positions.size
+            END,
+            updated_at = :now
+        FROM latest_prices
+        WHERE positions.is_open
+          AND positions.account_id = ANY(CAST(:account_ids AS uuid[]))
+          AND positions.instrument_id = latest_prices.instrument_id
+        RETURNING positions.account_id, positions.unrealized_pnl
+    )
+    SELECT account_id, count(*), coalesce(sum(unrealized_pnl), 0)
+    FROM updated
+    GROUP BY account_id
+    """
+)
+
+
+@app.task(name="tasks.positions.mark_to_market")
+def mark_to_market():
+    """
+    Mark every open position on the platform to the latest price.
+    
+    Runs periodically via Celery beat. Accounts are processed in chunks,
+    each re-priced by one set-based statement in its own transaction.
+    """
+    now = datetime.utcnow()
+    accounts = 0
+    positions = 0
+    after = None
+    
+    while True:
+        with engine.connect() as conn:
+            account_ids = [
+                str(account_id)
+                for (account_id,) in conn.execute(
+                    ACCOUNT_CHUNK_QUERY, {"after": after, "limit": ACCOUNTS_PER_CHUNK}
+                )
+            ]
+        if not account_ids:
+            break
+        
+        with engine.begin() as conn:
+            rows = conn.execute(
+                MARK_TO_MARKET_QUERY, {"account_ids": account_ids, "now": now}
+            ).fetchall()
+        
+        accounts += len(rows)
+        positions += sum(count for _, count, _ in rows)
+        after = account_ids[-1]
+    
+    return {
+        "status": "success",
+        "accounts": accounts,
+        "positions": positions,
+    }